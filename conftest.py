@@ -0,0 +1,29 @@
+"""
+Shared pytest fixtures for AlphaGen
+"""
+import os
+
+import pytest
+
+def pytest_configure(config):
+    """Write bytecode for src up front when ALPHAGEN_PRECOMPILE is set (CI)"""
+    # Only the controller compiles; xdist workers set workerinput
+    if os.environ.get('ALPHAGEN_PRECOMPILE') and not hasattr(config, 'workerinput'):
+        import compileall
+        compileall.compile_dir(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'),
+            quiet=1,
+            workers=0
+        )
+
+@pytest.fixture(scope="session")
+def config():
+    """Application configuration shared by all tests in the session"""
+    from src.config.settings import config
+    return config
+
+@pytest.fixture(scope="session")
+def lq45_symbols():
+    """LQ45 ticker symbols shared by all tests in the session"""
+    from src.data_pipeline.lq45_stocks import get_lq45_symbols
+    return get_lq45_symbols()
@@ -0,0 +1,21 @@
+"""
+Migration: widen the stock_prices primary key and apply TimescaleDB setup
+
+TimescaleDB requires every unique index on a hypertable to include the
+time column, so the primary key becomes (id, trade_date) before the
+hypertable, compression and continuous aggregate steps are applied.
+"""
+from _common import main
+
+PRIMARY_KEY_STATEMENTS = [
+    "ALTER TABLE stock_prices DROP CONSTRAINT IF EXISTS stock_prices_pkey;",
+    "ALTER TABLE stock_prices ADD CONSTRAINT stock_prices_pkey PRIMARY KEY (id, trade_date);",
+]
+
+async def rebuild_timescale(db_manager):
+    """Recreate the compression setup and weekly rollup"""
+    await db_manager.setup_hypertables()
+    await db_manager.setup_continuous_aggregates()
+
+if __name__ == "__main__":
+    main("stock_prices hypertable", PRIMARY_KEY_STATEMENTS, after=rebuild_timescale)
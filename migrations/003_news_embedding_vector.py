@@ -0,0 +1,28 @@
+"""
+Migration: store news_articles.embedding as a pgvector column
+
+Converts the JSON-serialized text embeddings to vector(EMBEDDING_DIM) in place and
+adds the HNSW cosine-distance index used for similarity search.
+"""
+from _common import main
+
+EMBEDDING_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS vector;",
+    "ALTER TABLE news_articles ALTER COLUMN embedding TYPE vector({dim}) USING embedding::vector({dim});",
+    """
+    CREATE INDEX IF NOT EXISTS idx_news_articles_embedding
+    ON news_articles USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+    """,
+]
+
+async def convert_embeddings(conn, db_manager):
+    """Convert the embedding column at the configured dimension"""
+    from sqlalchemy import text
+    from src.database.models import EMBEDDING_DIM
+    
+    for statement in EMBEDDING_STATEMENTS:
+        await conn.execute(text(statement.replace('{dim}', str(EMBEDDING_DIM))))
+
+if __name__ == "__main__":
+    main("news embedding", during=convert_embeddings)
@@ -0,0 +1,27 @@
+"""
+Migration: store stock_prices OHLC columns as DOUBLE PRECISION
+
+TimescaleDB can't change column types while compression is enabled or a
+continuous aggregate depends on the columns, so the compression setup and
+the weekly rollup are removed first and recreated by setup_hypertables().
+"""
+from _common import main
+
+PRICE_COLUMNS = ['open_price', 'high_price', 'low_price', 'close_price', 'adjusted_close']
+
+ALTER_STATEMENTS = [
+    f"ALTER TABLE stock_prices ALTER COLUMN {column} TYPE double precision USING {column}::double precision;"
+    for column in PRICE_COLUMNS
+]
+
+async def teardown_timescale(db_manager):
+    """Drop the compression setup and weekly rollup before altering columns"""
+    await db_manager.teardown_timescale_compression()
+
+async def rebuild_timescale(db_manager):
+    """Recreate the compression setup and weekly rollup"""
+    await db_manager.setup_hypertables()
+    await db_manager.setup_continuous_aggregates()
+
+if __name__ == "__main__":
+    main("stock_prices float", ALTER_STATEMENTS, before=teardown_timescale, after=rebuild_timescale)
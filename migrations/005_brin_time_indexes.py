@@ -0,0 +1,28 @@
+"""
+Migration: replace the btree time indexes with BRIN indexes
+
+stock_prices.trade_date and news_articles.published_at are written in
+roughly time order, so BRIN indexes cover date range scans at a fraction
+of the btree size. The redundant published_at index created by
+index=True and the default trade_date index TimescaleDB builds with the
+hypertable are dropped as well.
+"""
+from _common import main
+
+INDEX_STATEMENTS = [
+    "DROP INDEX IF EXISTS idx_stock_prices_date;",
+    "DROP INDEX IF EXISTS stock_prices_trade_date_idx;",
+    "DROP INDEX IF EXISTS idx_news_articles_published;",
+    "DROP INDEX IF EXISTS ix_news_articles_published_at;",
+    """
+    CREATE INDEX IF NOT EXISTS idx_stock_prices_date_brin
+    ON stock_prices USING brin (trade_date) WITH (pages_per_range = 32);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_news_articles_published_brin
+    ON news_articles USING brin (published_at) WITH (pages_per_range = 32);
+    """,
+]
+
+if __name__ == "__main__":
+    main("BRIN index", INDEX_STATEMENTS)
@@ -0,0 +1,36 @@
+"""
+Migration: deduplicate news articles on a 64-bit URL hash
+
+Adds news_articles.url_hash, backfills it from the existing URLs, makes it
+the unique dedup key and drops the unique btree on the url text column.
+"""
+from _common import main
+
+async def add_url_hash(conn, db_manager):
+    """Add, backfill and constrain the url_hash column"""
+    from sqlalchemy import text
+    from src.database.models import url_hash
+    from src.utils.logger import get_logger
+    
+    logger = get_logger(__name__)
+    
+    await conn.execute(text("ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS url_hash BIGINT;"))
+    
+    # Backfill hashes for existing rows
+    result = await conn.execute(text("SELECT id, url FROM news_articles WHERE url_hash IS NULL;"))
+    rows = [{'id': row.id, 'url_hash': url_hash(row.url)} for row in result]
+    if rows:
+        await conn.execute(
+            text("UPDATE news_articles SET url_hash = :url_hash WHERE id = :id;"),
+            rows
+        )
+    logger.info(f"Backfilled url_hash for {len(rows)} articles")
+    
+    await conn.execute(text("ALTER TABLE news_articles ALTER COLUMN url_hash SET NOT NULL;"))
+    await conn.execute(text("ALTER TABLE news_articles DROP CONSTRAINT IF EXISTS news_articles_url_key;"))
+    await conn.execute(text(
+        "ALTER TABLE news_articles ADD CONSTRAINT uq_news_url_hash UNIQUE (url_hash);"
+    ))
+
+if __name__ == "__main__":
+    main("news url_hash", during=add_url_hash)
@@ -0,0 +1,26 @@
+"""
+Migration: store data_ingestion_logs.process_metadata as JSONB
+
+Databases created before the column was renamed still have it as
+"metadata", which shadows the declarative Base.metadata attribute; it is
+renamed first, then converted from JSON text to JSONB.
+"""
+from _common import main
+
+METADATA_STATEMENTS = [
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'data_ingestion_logs' AND column_name = 'metadata'
+        ) THEN
+            ALTER TABLE data_ingestion_logs RENAME COLUMN metadata TO process_metadata;
+        END IF;
+    END $$;
+    """,
+    "ALTER TABLE data_ingestion_logs ALTER COLUMN process_metadata TYPE jsonb USING process_metadata::jsonb;",
+]
+
+if __name__ == "__main__":
+    main("ingestion metadata", METADATA_STATEMENTS)
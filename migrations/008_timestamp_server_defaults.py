@@ -0,0 +1,32 @@
+"""
+Migration: give created_at/updated_at columns a now() server default
+
+The models now rely on server_default=func.now() instead of sending now()
+with every INSERT, and price rows COPYed into stock_prices omit
+created_at entirely, so existing tables need the column defaults.
+"""
+from _common import main
+
+TIMESTAMP_COLUMNS = [
+    ('stocks', 'created_at'),
+    ('stocks', 'updated_at'),
+    ('stock_prices', 'created_at'),
+    ('financial_statements', 'created_at'),
+    ('financial_statements', 'updated_at'),
+    ('news_articles', 'created_at'),
+    ('news_articles', 'updated_at'),
+    ('quantitative_scores', 'created_at'),
+    ('sentiment_analysis', 'created_at'),
+    ('daily_recommendations', 'created_at'),
+    ('portfolios', 'created_at'),
+    ('portfolios', 'updated_at'),
+    ('trades', 'created_at'),
+]
+
+DEFAULT_STATEMENTS = [
+    f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT now();"
+    for table, column in TIMESTAMP_COLUMNS
+]
+
+if __name__ == "__main__":
+    main("timestamp server default", DEFAULT_STATEMENTS)
@@ -0,0 +1,26 @@
+"""
+Migration: store bounded sentiment/relevance scores as REAL
+
+The 0..1 and -1..1 score columns were Numeric(3, 2); REAL is fixed-width
+4 bytes and uses hardware arithmetic in sentiment aggregations.
+"""
+from _common import main
+
+SCORE_COLUMNS = [
+    ('news_articles', 'relevance_score'),
+    ('news_articles', 'sentiment_score'),
+    ('news_articles', 'confidence'),
+    ('news_stock_mentions', 'sentiment_impact'),
+    ('sentiment_analysis', 'sentiment_score'),
+    ('sentiment_analysis', 'confidence'),
+    ('sentiment_analysis', 'relevance'),
+]
+
+# sentiment_daily depends on the converted columns; init_database recreates it
+ALTER_STATEMENTS = ["DROP MATERIALIZED VIEW IF EXISTS sentiment_daily;"] + [
+    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE real USING {column}::real;"
+    for table, column in SCORE_COLUMNS
+]
+
+if __name__ == "__main__":
+    main("score column", ALTER_STATEMENTS)
@@ -0,0 +1,29 @@
+"""
+Migration: rebuild the (stock, date) indexes as covering DESC indexes
+
+Per-symbol history queries read the latest rows first and only need a
+few value columns, so the indexes order the date descending and INCLUDE
+those columns to allow index-only scans.
+"""
+from _common import main
+
+INDEX_STATEMENTS = [
+    "DROP INDEX IF EXISTS idx_stock_prices_stock_date;",
+    """
+    CREATE INDEX idx_stock_prices_stock_date
+    ON stock_prices (stock_id, trade_date DESC) INCLUDE (close_price, adjusted_close);
+    """,
+    "DROP INDEX IF EXISTS idx_quantitative_scores_stock_date;",
+    """
+    CREATE INDEX idx_quantitative_scores_stock_date
+    ON quantitative_scores (stock_id, analysis_date DESC) INCLUDE (composite_score);
+    """,
+    "DROP INDEX IF EXISTS idx_daily_recommendations_stock_date;",
+    """
+    CREATE INDEX idx_daily_recommendations_stock_date
+    ON daily_recommendations (stock_id, recommendation_date DESC) INCLUDE (combined_score, recommendation);
+    """,
+]
+
+if __name__ == "__main__":
+    main("covering index", INDEX_STATEMENTS)
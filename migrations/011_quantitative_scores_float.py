@@ -0,0 +1,22 @@
+"""
+Migration: store quantitative_scores metrics as DOUBLE PRECISION
+
+Ratios, indicators and 0-100 scores are computed as floats and only ever
+aggregated, so exact Numeric arithmetic buys nothing here.
+"""
+from _common import main
+
+SCORE_COLUMNS = [
+    'pe_ratio', 'pb_ratio', 'pe_relative_score', 'pb_relative_score',
+    'rsi', 'rsi_score', 'ma_50', 'ma_200', 'ma_score', 'volume_score',
+    'valuation_score', 'technical_score', 'composite_score',
+]
+
+# quantitative_scores_weekly depends on the converted columns; init_database recreates it
+ALTER_STATEMENTS = ["DROP MATERIALIZED VIEW IF EXISTS quantitative_scores_weekly;"] + [
+    f"ALTER TABLE quantitative_scores ALTER COLUMN {column} TYPE double precision USING {column}::double precision;"
+    for column in SCORE_COLUMNS
+]
+
+if __name__ == "__main__":
+    main("quantitative score column", ALTER_STATEMENTS)
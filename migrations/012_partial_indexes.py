@@ -0,0 +1,30 @@
+"""
+Migration: replace low-selectivity btree indexes with partial indexes
+
+Only unprocessed news articles and BUY/SELL recommendations are ever
+filtered on, so the full indexes on is_processed and recommendation are
+swapped for small partial indexes keyed on those minority predicates.
+"""
+from _common import main
+
+INDEX_STATEMENTS = [
+    "DROP INDEX IF EXISTS idx_news_articles_processed;",
+    "DROP INDEX IF EXISTS idx_daily_recommendations_rec;",
+    """
+    CREATE INDEX IF NOT EXISTS idx_news_unprocessed
+    ON news_articles (published_at) WHERE is_processed = false;
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_daily_rec_buy
+    ON daily_recommendations (recommendation_date) INCLUDE (stock_id, combined_score)
+    WHERE recommendation = 'BUY';
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_daily_rec_sell
+    ON daily_recommendations (recommendation_date) INCLUDE (stock_id, combined_score)
+    WHERE recommendation = 'SELL';
+    """,
+]
+
+if __name__ == "__main__":
+    main("partial index", INDEX_STATEMENTS)
@@ -0,0 +1,82 @@
+"""
+Migration: widen stock_prices.volume, narrow small counters and use enum types
+
+stock_prices.volume becomes BIGINT because daily volumes can exceed the
+32-bit range. fiscal_quarter and mention_count become SMALLINT, and the
+fixed label columns move from VARCHAR to Postgres enum types. Views and
+indexes that depend on the altered columns are dropped first and
+recreated afterwards.
+"""
+from _common import main
+
+DEPENDENCY_STATEMENTS = [
+    "DROP MATERIALIZED VIEW IF EXISTS quantitative_scores_weekly;",
+    "DROP INDEX IF EXISTS idx_daily_rec_buy;",
+    "DROP INDEX IF EXISTS idx_daily_rec_sell;",
+]
+
+ENUM_TYPES = {
+    'sentiment_label_t': ('positive', 'negative', 'neutral'),
+    'ma_signal_t': ('bullish', 'bearish', 'neutral'),
+    'volume_trend_t': ('increasing', 'decreasing', 'stable'),
+    'recommendation_t': ('BUY', 'HOLD', 'SELL'),
+    'confidence_level_t': ('HIGH', 'MEDIUM', 'LOW'),
+}
+
+CREATE_TYPE_STATEMENTS = [
+    f"""
+    DO $$ BEGIN
+        CREATE TYPE {name} AS ENUM ({', '.join(f"'{value}'" for value in values)});
+    EXCEPTION WHEN duplicate_object THEN NULL;
+    END $$;
+    """
+    for name, values in ENUM_TYPES.items()
+]
+
+ENUM_COLUMNS = [
+    ('news_articles', 'sentiment_label', 'sentiment_label_t'),
+    ('quantitative_scores', 'ma_signal', 'ma_signal_t'),
+    ('quantitative_scores', 'volume_trend', 'volume_trend_t'),
+    ('daily_recommendations', 'recommendation', 'recommendation_t'),
+    ('daily_recommendations', 'confidence_level', 'confidence_level_t'),
+]
+
+ALTER_STATEMENTS = [
+    "ALTER TABLE stock_prices ALTER COLUMN volume TYPE bigint;",
+    "ALTER TABLE financial_statements ALTER COLUMN fiscal_quarter TYPE smallint;",
+    "ALTER TABLE news_stock_mentions ALTER COLUMN mention_count TYPE smallint;",
+] + [
+    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name};"
+    for table, column, type_name in ENUM_COLUMNS
+]
+
+INDEX_STATEMENTS = [
+    """
+    CREATE INDEX IF NOT EXISTS idx_daily_rec_buy
+    ON daily_recommendations (recommendation_date) INCLUDE (stock_id, combined_score)
+    WHERE recommendation = 'BUY';
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_daily_rec_sell
+    ON daily_recommendations (recommendation_date) INCLUDE (stock_id, combined_score)
+    WHERE recommendation = 'SELL';
+    """,
+]
+
+async def teardown_timescale(db_manager):
+    """Drop the compression setup and weekly rollup before altering columns"""
+    await db_manager.teardown_timescale_compression()
+
+async def rebuild_dependents(db_manager):
+    """Recreate the TimescaleDB setup and the views dropped for the type changes"""
+    await db_manager.setup_hypertables()
+    await db_manager.setup_continuous_aggregates()
+    await db_manager.setup_rollup_views()
+
+if __name__ == "__main__":
+    main(
+        "column type",
+        DEPENDENCY_STATEMENTS + CREATE_TYPE_STATEMENTS + ALTER_STATEMENTS + INDEX_STATEMENTS,
+        before=teardown_timescale,
+        after=rebuild_dependents
+    )
@@ -0,0 +1,21 @@
+"""
+Migration: add a covering index for the latest top recommendations
+
+The recommendations endpoint reads one recommendation_date ordered by
+combined_score, so (recommendation_date, combined_score DESC) with the
+displayed columns included serves it from the index. It supersedes the
+standalone combined_score index, which is dropped.
+"""
+from _common import main
+
+INDEX_STATEMENTS = [
+    "DROP INDEX IF EXISTS idx_daily_recommendations_score;",
+    """
+    CREATE INDEX IF NOT EXISTS idx_daily_rec_top
+    ON daily_recommendations (recommendation_date, combined_score DESC)
+    INCLUDE (stock_id, recommendation, confidence_level);
+    """,
+]
+
+if __name__ == "__main__":
+    main("recommendations index", INDEX_STATEMENTS)
@@ -0,0 +1,35 @@
+"""
+Migration: store theme and signal columns as native arrays and JSONB
+
+themes, key_themes and risk_factors held JSON-encoded text arrays and
+technical_signals a JSON-encoded object. They become TEXT[] and JSONB so
+theme filters and counts run in the database, with a GIN index on
+news_articles.themes.
+"""
+from _common import main
+
+# ALTER ... USING can't contain a subquery, so the conversion goes through
+# a temporary helper function
+HELPER_FUNCTION = """
+CREATE OR REPLACE FUNCTION pg_temp.json_text_array(value text) RETURNS text[] AS $$
+    SELECT ARRAY(SELECT jsonb_array_elements_text(value::jsonb))
+$$ LANGUAGE sql IMMUTABLE;
+"""
+
+ARRAY_COLUMNS = [
+    ('news_articles', 'themes'),
+    ('sentiment_analysis', 'themes'),
+    ('daily_recommendations', 'key_themes'),
+    ('daily_recommendations', 'risk_factors'),
+]
+
+ALTER_STATEMENTS = [
+    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE text[] USING pg_temp.json_text_array({column});"
+    for table, column in ARRAY_COLUMNS
+] + [
+    "ALTER TABLE daily_recommendations ALTER COLUMN technical_signals TYPE jsonb USING technical_signals::jsonb;",
+    "CREATE INDEX IF NOT EXISTS idx_news_themes_gin ON news_articles USING gin (themes);",
+]
+
+if __name__ == "__main__":
+    main("array/JSONB column", [HELPER_FUNCTION] + ALTER_STATEMENTS)
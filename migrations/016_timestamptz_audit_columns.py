@@ -0,0 +1,55 @@
+"""
+Migration: store created_at/updated_at as timestamptz and fill updated_at by trigger
+
+The audit columns become timestamp with time zone, and updated_at is set
+by a BEFORE UPDATE trigger instead of the ORM's onupdate, so Core and
+bulk UPDATE statements keep it current too. stock_prices.created_at sits
+on the hypertable, so the TimescaleDB compression setup and the views
+reading these columns are dropped first and recreated afterwards.
+"""
+from _common import main
+
+TIMESTAMP_COLUMNS = [
+    ('stocks', 'created_at'),
+    ('stocks', 'updated_at'),
+    ('stock_prices', 'created_at'),
+    ('financial_statements', 'created_at'),
+    ('financial_statements', 'updated_at'),
+    ('news_articles', 'created_at'),
+    ('news_articles', 'updated_at'),
+    ('quantitative_scores', 'created_at'),
+    ('sentiment_analysis', 'created_at'),
+    ('daily_recommendations', 'created_at'),
+    ('portfolios', 'created_at'),
+    ('portfolios', 'updated_at'),
+    ('trades', 'created_at'),
+]
+
+# Existing values are read in the session time zone
+ALTER_STATEMENTS = ["DROP MATERIALIZED VIEW IF EXISTS sentiment_daily;"] + [
+    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE timestamptz;"
+    for table, column in TIMESTAMP_COLUMNS
+]
+
+async def teardown_timescale(db_manager):
+    """Drop the compression setup and weekly rollup before altering columns"""
+    await db_manager.teardown_timescale_compression()
+
+async def create_triggers(conn, db_manager):
+    """Install the updated_at triggers alongside the column changes"""
+    await db_manager.setup_updated_at_triggers(conn)
+
+async def rebuild_dependents(db_manager):
+    """Recreate the TimescaleDB setup and the views dropped for the type changes"""
+    await db_manager.setup_hypertables()
+    await db_manager.setup_continuous_aggregates()
+    await db_manager.setup_rollup_views()
+
+if __name__ == "__main__":
+    main(
+        "timestamptz",
+        ALTER_STATEMENTS,
+        before=teardown_timescale,
+        during=create_triggers,
+        after=rebuild_dependents
+    )
@@ -0,0 +1,15 @@
+"""
+Migration: tune fillfactor and autovacuum on the daily score tables
+
+quantitative_scores and daily_recommendations are rewritten per symbol
+every day. A fillfactor of 80 leaves room for HOT updates, and lower
+autovacuum scale factors keep them vacuumed and analyzed between runs.
+"""
+from _common import main
+
+async def tune_storage(db_manager):
+    """Apply the fillfactor and autovacuum settings"""
+    await db_manager.setup_table_storage()
+
+if __name__ == "__main__":
+    main("score table storage", after=tune_storage)
@@ -0,0 +1,25 @@
+"""
+Migration: make data_ingestion_logs a hypertable with a BRIN time index
+
+The log table is append-only and time ordered, so its btree start_time
+index is replaced by BRIN and the table is chunked on start_time with a
+retention policy. TimescaleDB requires start_time in the primary key.
+"""
+from _common import main
+
+SCHEMA_STATEMENTS = [
+    "ALTER TABLE data_ingestion_logs DROP CONSTRAINT IF EXISTS data_ingestion_logs_pkey;",
+    "ALTER TABLE data_ingestion_logs ADD CONSTRAINT data_ingestion_logs_pkey PRIMARY KEY (id, start_time);",
+    "DROP INDEX IF EXISTS idx_data_ingestion_logs_time;",
+    """
+    CREATE INDEX IF NOT EXISTS idx_data_ingestion_logs_time_brin
+    ON data_ingestion_logs USING brin (start_time) WITH (pages_per_range = 32);
+    """,
+]
+
+async def create_hypertable(db_manager):
+    """Convert the table and add its retention policy"""
+    await db_manager.setup_hypertables()
+
+if __name__ == "__main__":
+    main("ingestion log hypertable", SCHEMA_STATEMENTS, after=create_hypertable)
@@ -0,0 +1,65 @@
+"""
+Shared runner for the numbered migration scripts
+
+Each script declares its SQL and hands it to main(), which handles path
+setup, logging, the transaction and closing the connection pools.
+"""
+import asyncio
+import sys
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Sequence
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+async def run_migration(
+    description: str,
+    statements: Sequence[str] = (),
+    before: Optional[Callable[..., Awaitable]] = None,
+    during: Optional[Callable[..., Awaitable]] = None,
+    after: Optional[Callable[..., Awaitable]] = None
+) -> bool:
+    """Run statements in one transaction between optional setup hooks
+    
+    before(db_manager) and after(db_manager) run outside the transaction;
+    during(conn, db_manager) runs inside it once the statements are applied.
+    """
+    try:
+        # Import after path setup
+        from sqlalchemy import text
+        from src.database.database import db_manager
+        from src.utils.logger import get_logger
+        
+        logger = get_logger(__name__)
+        logger.info(f"Starting {description} migration...")
+        
+        if before is not None:
+            await before(db_manager)
+        
+        if statements or during is not None:
+            async with db_manager.async_engine.begin() as conn:
+                for statement in statements:
+                    await conn.execute(text(statement))
+                if during is not None:
+                    await during(conn, db_manager)
+        
+        if after is not None:
+            await after(db_manager)
+        
+        logger.info("Database migration completed successfully")
+        return True
+        
+    except Exception as e:
+        print(f"Database migration failed: {e}")
+        return False
+    finally:
+        try:
+            await db_manager.close()
+        except:
+            pass
+
+def main(description: str, statements: Sequence[str] = (), **hooks):
+    """Run a migration and exit with its status"""
+    success = asyncio.run(run_migration(description, statements, **hooks))
+    sys.exit(0 if success else 1)
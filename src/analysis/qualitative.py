@@ -16,11 +16,12 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any
 from sqlalchemy import select, and_, update, desc
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
-from ..database.database import db_manager
+from ..database.database import get_db_manager
 from ..database.models import NewsArticle, Stock, SentimentAnalysis, NewsStockMention
 from ..utils.logger import get_logger
 from ..config.settings import config
@@ -226,9 +227,10 @@ ARTICLE TEXT:
         """
         cutoff_time = datetime.now() - timedelta(hours=hours_back)
         
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_async_session() as session:
             query = (
                 select(NewsArticle)
+                .options(undefer(NewsArticle.content))
                 .where(
                     and_(
                         NewsArticle.published_at >= cutoff_time,
@@ -322,7 +324,7 @@ ARTICLE TEXT:
         
         saved_count = 0
         
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_write_session() as session:
             for result in analysis_results:
                 try:
                     article_id = result['article_id']
@@ -332,7 +334,7 @@ ARTICLE TEXT:
                         news_article_id=article_id,
                         sentiment_score=result['sentiment_score'],
                         confidence=result['confidence'],
-                        themes=json.dumps(result['themes']),
+                        themes=result['themes'],
                         summary=result['summary'],
                         relevance=result['relevance'],
                         model_used=result['model_used'],
@@ -348,7 +350,7 @@ ARTICLE TEXT:
                         .values(
                             sentiment_score=result['sentiment_score'],
                             confidence=result['confidence'],
-                            themes=json.dumps(result['themes']),
+                            themes=result['themes'],
                             ai_summary=result['summary'],
                             processed_at=datetime.now()
                         )
@@ -408,7 +410,7 @@ ARTICLE TEXT:
         """
         cutoff_time = datetime.now() - timedelta(hours=hours_back)
         
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_async_session() as session:
             # Get articles with sentiment analysis and stock mentions
             query = (
                 select(
@@ -454,12 +456,7 @@ ARTICLE TEXT:
                     symbol_sentiment[symbol]['confidence_scores'].append(float(row.confidence))
                 
                 if row.themes:
-                    try:
-                        themes = json.loads(row.themes)
-                        if isinstance(themes, list):
-                            symbol_sentiment[symbol]['themes'].extend(themes)
-                    except:
-                        pass
+                    symbol_sentiment[symbol]['themes'].extend(row.themes)
                 
                 symbol_sentiment[symbol]['article_count'] += 1
             
@@ -15,7 +15,7 @@ from typing import List, Dict, Optional, Tuple
 from sqlalchemy import select, and_, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database.database import db_manager
+from ..database.database import get_db_manager
 from ..database.models import Stock, StockPrice, FinancialStatement, QuantitativeScores
 from ..utils.logger import get_logger
 
@@ -37,7 +37,7 @@ class QuantitativeAnalyzer:
         Returns:
             DataFrame with latest market data
         """
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_async_session() as session:
             # Base query for stocks and their latest prices
             query = (
                 select(
@@ -90,7 +90,7 @@ class QuantitativeAnalyzer:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_async_session() as session:
             query = (
                 select(
                     StockPrice.trade_date,
@@ -134,7 +134,7 @@ class QuantitativeAnalyzer:
     
     async def get_latest_financial_data(self, symbol: str) -> Optional[Dict]:
         """Get latest financial statement data for a stock"""
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_async_session() as session:
             query = (
                 select(FinancialStatement)
                 .join(Stock, Stock.id == FinancialStatement.stock_id)
@@ -429,12 +429,21 @@ class QuantitativeAnalyzer:
             self.logger.error(f"Error analyzing {symbol}: {e}")
             return {}
     
-    async def save_quantitative_scores(self, analysis_results: List[Dict]) -> int:
+    async def fetch_lq45_stock_ids(self) -> Dict[str, int]:
+        """Get the LQ45 ticker universe as a symbol -> stock_id mapping in one query"""
+        async with get_db_manager().get_async_session() as session:
+            query = select(Stock.symbol, Stock.id).where(Stock.is_lq45 == True)
+            result = await session.execute(query)
+            return {symbol: stock_id for symbol, stock_id in result.fetchall()}
+    
+    async def save_quantitative_scores(self, analysis_results: List[Dict], stock_ids: Dict[str, int] = None) -> int:
         """
         Save quantitative analysis results to database
         
         Args:
             analysis_results: List of analysis result dictionaries
+            stock_ids: Optional symbol -> stock_id mapping; symbols found here
+                skip the per-row stock lookup
             
         Returns:
             Number of records saved
@@ -444,16 +453,18 @@ class QuantitativeAnalyzer:
         
         saved_count = 0
         
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_write_session() as session:
             for result in analysis_results:
                 if not result:
                     continue
                 
                 try:
                     # Get stock_id
-                    stock_query = select(Stock.id).where(Stock.symbol == result['symbol'])
-                    stock_result = await session.execute(stock_query)
-                    stock_id = stock_result.scalar_one_or_none()
+                    stock_id = stock_ids.get(result['symbol']) if stock_ids else None
+                    if stock_id is None:
+                        stock_query = select(Stock.id).where(Stock.symbol == result['symbol'])
+                        stock_result = await session.execute(stock_query)
+                        stock_id = stock_result.scalar_one_or_none()
                     
                     if not stock_id:
                         self.logger.warning(f"Stock not found: {result['symbol']}")
@@ -505,13 +516,13 @@ class QuantitativeAnalyzer:
         self.logger.info("Starting quantitative analysis pipeline")
         
         try:
+            # Fetch the ticker universe once; it is reused when saving scores
+            stock_ids = await self.fetch_lq45_stock_ids()
+            
             # Get symbols to analyze
             if not symbols:
                 # Get all LQ45 symbols
-                async with db_manager.get_async_session() as session:
-                    query = select(Stock.symbol).where(Stock.is_lq45 == True)
-                    result = await session.execute(query)
-                    symbols = [row[0] for row in result.fetchall()]
+                symbols = list(stock_ids)
             
             if not symbols:
                 self.logger.warning("No symbols found for analysis")
@@ -533,7 +544,7 @@ class QuantitativeAnalyzer:
                     error_count += 1
             
             # Save results
-            saved_count = await self.save_quantitative_scores(analysis_results)
+            saved_count = await self.save_quantitative_scores(analysis_results, stock_ids)
             
             summary = {
                 'analyzed': len(analysis_results),
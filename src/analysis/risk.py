@@ -9,7 +9,7 @@ from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database.models import Stock, StockPrice
-from ..database.database import db_manager
+from ..database.database import get_db_manager
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -33,7 +33,7 @@ class RiskAnalyzer:
             Dict containing volatility metrics and risk score
         """
         try:
-            async with db_manager.get_async_session() as db:
+            async with get_db_manager().get_async_session() as db:
                 # Find the stock
                 stock_query = select(Stock).where(Stock.symbol == symbol.upper())
                 stock_result = await db.execute(stock_query)
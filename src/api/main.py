@@ -1,13 +1,14 @@
 """
 FastAPI application for AlphaGen Investment Platform
 """
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.responses import JSONResponse
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+from contextlib import asynccontextmanager
 import asyncio
 
-from ..database.database import get_async_db_session, db_manager
+from ..database.database import get_db_manager
 from ..database.models import (
     Stock, StockPrice, NewsArticle, DataIngestionLog,
     QuantitativeScores, SentimentAnalysis, DailyRecommendations,
@@ -26,34 +27,41 @@ from .schemas import (
 from sqlalchemy import select, func, desc, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
-import json
-
-app = FastAPI(
-    title="AlphaGen Investment Platform API",
-    description="Personal AI Investment Platform for Indonesian Stock Market",
-    version="1.0.0"
-)
 
 logger = get_logger(__name__)
 pipeline = DataPipeline()
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize application on startup"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database manager on startup and clean up on shutdown"""
     logger.info("Starting AlphaGen API server")
+    app.state.db = get_db_manager()
     
     # Initialize database connection
     try:
-        await db_manager.check_connection()
+        await app.state.db.check_connection()
+        # The API only reads through the async engine
+        await app.state.db.prewarm(app.state.db.async_engine)
         logger.info("Database connection established")
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
+    
+    yield
+    
     logger.info("Shutting down AlphaGen API server")
-    await db_manager.close()
+    await app.state.db.close()
+
+app = FastAPI(
+    title="AlphaGen Investment Platform API",
+    description="Personal AI Investment Platform for Indonesian Stock Market",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+async def get_async_db_session(request: Request):
+    """Dependency that yields a session from the app's database manager"""
+    async with request.app.state.db.get_async_session() as session:
+        yield session
 
 @app.get("/")
 async def root():
@@ -344,28 +352,10 @@ async def get_latest_recommendations(
                 market_cap=float(stock.market_cap) if stock.market_cap else None
             )
             
-            # Parse JSON fields safely
-            key_themes = []
-            technical_signals = {}
-            risk_factors = []
-            
-            try:
-                if recommendation.key_themes:
-                    key_themes = json.loads(recommendation.key_themes)
-            except (json.JSONDecodeError, TypeError):
-                pass
-                
-            try:
-                if recommendation.technical_signals:
-                    technical_signals = json.loads(recommendation.technical_signals)
-            except (json.JSONDecodeError, TypeError):
-                pass
-                
-            try:
-                if recommendation.risk_factors:
-                    risk_factors = json.loads(recommendation.risk_factors)
-            except (json.JSONDecodeError, TypeError):
-                pass
+            # Array/JSONB columns come back as Python lists and dicts
+            key_themes = recommendation.key_themes or []
+            technical_signals = recommendation.technical_signals or {}
+            risk_factors = recommendation.risk_factors or []
             
             response_data.append(RecommendationResponse(
                 stock_id=recommendation.stock_id,
@@ -428,28 +418,10 @@ async def get_latest_recommendation_for_symbol(
             market_cap=float(stock.market_cap) if stock.market_cap else None
         )
         
-        # Parse JSON fields safely
-        key_themes = []
-        technical_signals = {}
-        risk_factors = []
-        
-        try:
-            if recommendation.key_themes:
-                key_themes = json.loads(recommendation.key_themes)
-        except (json.JSONDecodeError, TypeError):
-            pass
-            
-        try:
-            if recommendation.technical_signals:
-                technical_signals = json.loads(recommendation.technical_signals)
-        except (json.JSONDecodeError, TypeError):
-            pass
-            
-        try:
-            if recommendation.risk_factors:
-                risk_factors = json.loads(recommendation.risk_factors)
-        except (json.JSONDecodeError, TypeError):
-            pass
+        # Array/JSONB columns come back as Python lists and dicts
+        key_themes = recommendation.key_themes or []
+        technical_signals = recommendation.technical_signals or {}
+        risk_factors = recommendation.risk_factors or []
         
         return RecommendationResponse(
             stock_id=recommendation.stock_id,
@@ -590,12 +562,8 @@ async def get_qualitative_scores(
             total_sentiment += float(sentiment.sentiment_score)
             total_confidence += float(sentiment.confidence)
             
-            try:
-                if sentiment.themes:
-                    themes = json.loads(sentiment.themes)
-                    all_themes.extend(themes)
-            except (json.JSONDecodeError, TypeError):
-                pass
+            if sentiment.themes:
+                all_themes.extend(sentiment.themes)
         
         count = len(sentiment_data)
         average_sentiment = total_sentiment / count
@@ -751,7 +719,6 @@ async def add_trade_to_portfolio(
         
         db.add(trade)
         await db.commit()
-        await db.refresh(trade)
         
         return TradeResponse(
             id=trade.id,
@@ -29,6 +29,15 @@ class Config:
         """Get async database URL"""
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
+    # TimescaleDB Configuration (PostgreSQL interval strings)
+    STOCK_PRICE_CHUNK_INTERVAL: str = os.getenv("STOCK_PRICE_CHUNK_INTERVAL", "30 days")
+    STOCK_PRICE_COMPRESS_AFTER: str = os.getenv("STOCK_PRICE_COMPRESS_AFTER", "30 days")
+    INGESTION_LOG_CHUNK_INTERVAL: str = os.getenv("INGESTION_LOG_CHUNK_INTERVAL", "7 days")
+    INGESTION_LOG_RETENTION: str = os.getenv("INGESTION_LOG_RETENTION", "90 days")
+    
+    # Dimension of news article embeddings (must match the embedding model)
+    EMBEDDING_DIM: int = int(os.getenv("EMBEDDING_DIM", "768"))
+    
     # API Keys
     NEWS_API_KEY: Optional[str] = os.getenv("NEWS_API_KEY")
     GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY")
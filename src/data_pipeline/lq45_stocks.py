@@ -1,6 +1,7 @@
 """
 LQ45 stock symbols and market data utilities
 """
+from functools import lru_cache
 
 # LQ45 Index constituents (Top 45 liquid stocks on IDX)
 # Updated as of August 2025 - these are the major Indonesian stocks
@@ -80,9 +81,10 @@ LQ45_STOCKS = [
 # Yahoo Finance suffix for Indonesian stocks
 IDX_SUFFIX = ".JK"
 
-def get_lq45_symbols() -> list[str]:
-    """Get list of LQ45 stock symbols"""
-    return [symbol for symbol, _ in LQ45_STOCKS]
+@lru_cache(maxsize=1)
+def get_lq45_symbols() -> tuple[str, ...]:
+    """Get LQ45 stock symbols (cached, immutable)"""
+    return tuple(symbol for symbol, _ in LQ45_STOCKS)
 
 def get_lq45_companies() -> dict[str, str]:
     """Get mapping of symbols to company names"""
@@ -9,13 +9,14 @@ import asyncio
 from sqlalchemy import select, insert, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from ..database.database import db_manager
-from ..database.models import Stock, StockPrice, FinancialStatement, DataIngestionLog
-from ..utils.logger import get_pipeline_logger
+from ..database.database import get_db_manager, PriceRow
+from ..database.bulk import bulk_upsert_financial_statements
+from ..database.models import Stock, StockPrice, DataIngestionLog
+from ..utils.logger import get_market_logger
 from .lq45_stocks import LQ45_STOCKS, get_lq45_symbols
 from ..config.settings import config
 
-logger = get_pipeline_logger()
+logger = get_market_logger()
 
 class MarketDataCollector:
     """Collect and store market data for Indonesian stocks"""
@@ -28,7 +29,7 @@ class MarketDataCollector:
         """Initialize stocks table with LQ45 companies"""
         logger.info("Initializing stocks table with LQ45 companies")
         
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_write_session() as session:
             for symbol, company_name in LQ45_STOCKS:
                 # Check if stock already exists
                 stmt = select(Stock).where(Stock.symbol == symbol)
@@ -53,6 +54,7 @@ class MarketDataCollector:
             
             await session.commit()
         
+        get_db_manager().invalidate_stock_ids()
         logger.info("Stocks table initialization completed")
     
     async def collect_daily_prices(self, days_back: int = 1) -> Dict[str, int]:
@@ -73,15 +75,13 @@ class MarketDataCollector:
                 'total_records': 0
             }
             
-            async with db_manager.get_async_session() as session:
+            async with get_db_manager().get_write_session() as session:
                 for symbol in self.symbols:
                     try:
                         # Get stock ID
-                        stmt = select(Stock).where(Stock.symbol == symbol)
-                        result = await session.execute(stmt)
-                        stock = result.scalar_one_or_none()
+                        stock_id = await get_db_manager().get_stock_id(symbol)
                         
-                        if not stock:
+                        if stock_id is None:
                             logger.warning(f"Stock {symbol} not found in database, skipping")
                             results['failed'] += 1
                             continue
@@ -98,39 +98,48 @@ class MarketDataCollector:
                             results['failed'] += 1
                             continue
                         
-                        # Process each day's data
-                        records_inserted = 0
-                        for date, row in hist.iterrows():
+                        # Dates already stored for this stock in the window
+                        existing_stmt = select(StockPrice.trade_date).where(
+                            StockPrice.stock_id == stock_id,
+                            StockPrice.trade_date >= datetime.combine(start_date.date(), datetime.min.time())
+                        )
+                        existing = await session.execute(existing_stmt)
+                        existing_dates = {d.date() for d in existing.scalars()}
+                        
+                        # Build new price rows column-wise instead of a Series per row
+                        records = []
+                        columns = zip(
+                            hist.index,
+                            hist['Open'].tolist(),
+                            hist['High'].tolist(),
+                            hist['Low'].tolist(),
+                            hist['Close'].tolist(),
+                            hist['Volume'].tolist()
+                        )
+                        for date, open_price, high_price, low_price, close_price, volume in columns:
                             try:
-                                # Check if record already exists
-                                check_stmt = select(StockPrice).where(
-                                    StockPrice.stock_id == stock.id,
-                                    StockPrice.trade_date == date.date()
-                                )
-                                existing = await session.execute(check_stmt)
-                                if existing.scalar_one_or_none():
+                                trade_date = date.date()
+                                if trade_date in existing_dates:
                                     continue  # Skip existing records
                                 
-                                # Insert new price record
-                                price_data = StockPrice(
-                                    stock_id=stock.id,
-                                    trade_date=date.date(),
-                                    open_price=float(row['Open']),
-                                    high_price=float(row['High']),
-                                    low_price=float(row['Low']),
-                                    close_price=float(row['Close']),
-                                    volume=int(row['Volume']),
-                                    adjusted_close=float(row['Close'])  # Yahoo Finance already provides adjusted close
-                                )
-                                session.add(price_data)
-                                records_inserted += 1
+                                records.append(PriceRow(
+                                    stock_id=stock_id,
+                                    trade_date=datetime.combine(trade_date, datetime.min.time()),
+                                    open_price=float(open_price),
+                                    high_price=float(high_price),
+                                    low_price=float(low_price),
+                                    close_price=float(close_price),
+                                    volume=int(volume),
+                                    adjusted_close=float(close_price)  # Yahoo Finance already provides adjusted close
+                                ))
                                 
                             except Exception as e:
                                 logger.error(f"Error processing price data for {symbol} on {date}: {e}")
                                 continue
                         
+                        # COPY the new rows in one round trip
+                        records_inserted = await get_db_manager().bulk_insert_stock_prices(records)
                         if records_inserted > 0:
-                            await session.commit()
                             logger.info(f"Inserted {records_inserted} price records for {symbol}")
                             results['total_records'] += records_inserted
                         
@@ -169,75 +178,61 @@ class MarketDataCollector:
                 'total_records': 0
             }
             
-            async with db_manager.get_async_session() as session:
-                for symbol in symbols:
-                    try:
-                        # Get stock ID
-                        stmt = select(Stock).where(Stock.symbol == symbol)
-                        result = await session.execute(stmt)
-                        stock = result.scalar_one_or_none()
-                        
-                        if not stock:
-                            logger.warning(f"Stock {symbol} not found in database, skipping")
-                            results['failed'] += 1
-                            continue
-                        
-                        # Fetch financial data from Yahoo Finance
-                        ticker = yf.Ticker(symbol)
-                        
-                        # Get quarterly and annual financials
-                        for statement_type, financials in [
-                            ('quarterly', ticker.quarterly_financials),
-                            ('annual', ticker.financials)
-                        ]:
-                            if financials.empty:
-                                continue
-                                
-                            for period, data in financials.items():
-                                try:
-                                    # Extract key financial metrics
-                                    period_date = period.date() if hasattr(period, 'date') else period
-                                    
-                                    # Check if record already exists
-                                    check_stmt = select(FinancialStatement).where(
-                                        FinancialStatement.stock_id == stock.id,
-                                        FinancialStatement.statement_type == statement_type,
-                                        FinancialStatement.period_end == period_date
-                                    )
-                                    existing = await session.execute(check_stmt)
-                                    if existing.scalar_one_or_none():
-                                        continue
-                                    
-                                    # Create financial statement record
-                                    financial_stmt = FinancialStatement(
-                                        stock_id=stock.id,
-                                        statement_type=statement_type,
-                                        period_end=period_date,
-                                        fiscal_year=period_date.year,
-                                        fiscal_quarter=((period_date.month - 1) // 3) + 1 if statement_type == 'quarterly' else None,
-                                        # Extract available financial data
-                                        revenue=self._safe_extract_value(data, ['Total Revenue', 'Revenue']),
-                                        gross_profit=self._safe_extract_value(data, ['Gross Profit']),
-                                        operating_income=self._safe_extract_value(data, ['Operating Income']),
-                                        net_income=self._safe_extract_value(data, ['Net Income']),
-                                        ebitda=self._safe_extract_value(data, ['EBITDA']),
-                                    )
-                                    
-                                    session.add(financial_stmt)
-                                    results['total_records'] += 1
-                                    
-                                except Exception as e:
-                                    logger.error(f"Error processing financial data for {symbol} period {period}: {e}")
-                                    continue
-                        
-                        results['success'] += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error collecting financial data for {symbol}: {e}")
+            statement_rows = []
+            
+            for symbol in symbols:
+                try:
+                    # Get stock ID
+                    stock_id = await get_db_manager().get_stock_id(symbol)
+                    
+                    if stock_id is None:
+                        logger.warning(f"Stock {symbol} not found in database, skipping")
                         results['failed'] += 1
                         continue
-                
-                await session.commit()
+                    
+                    # Fetch financial data from Yahoo Finance
+                    ticker = yf.Ticker(symbol)
+                    
+                    # Get quarterly and annual financials
+                    for statement_type, financials in [
+                        ('quarterly', ticker.quarterly_financials),
+                        ('annual', ticker.financials)
+                    ]:
+                        if financials.empty:
+                            continue
+                            
+                        for period, data in financials.items():
+                            try:
+                                # Extract key financial metrics
+                                period_date = period.date() if hasattr(period, 'date') else period
+                                
+                                # Existing periods are skipped by the insert's conflict clause
+                                statement_rows.append({
+                                    'stock_id': stock_id,
+                                    'statement_type': statement_type,
+                                    'period_end': period_date,
+                                    'fiscal_year': period_date.year,
+                                    'fiscal_quarter': ((period_date.month - 1) // 3) + 1 if statement_type == 'quarterly' else None,
+                                    # Extract available financial data
+                                    'revenue': self._safe_extract_value(data, ['Total Revenue', 'Revenue']),
+                                    'gross_profit': self._safe_extract_value(data, ['Gross Profit']),
+                                    'operating_income': self._safe_extract_value(data, ['Operating Income']),
+                                    'net_income': self._safe_extract_value(data, ['Net Income']),
+                                    'ebitda': self._safe_extract_value(data, ['EBITDA']),
+                                })
+                                
+                            except Exception as e:
+                                logger.error(f"Error processing financial data for {symbol} period {period}: {e}")
+                                continue
+                    
+                    results['success'] += 1
+                    
+                except Exception as e:
+                    logger.error(f"Error collecting financial data for {symbol}: {e}")
+                    results['failed'] += 1
+                    continue
+            
+            results['total_records'] = await bulk_upsert_financial_statements(statement_rows)
             
             # Log completion
             await self._log_completion(session_id, results['total_records'])
@@ -261,20 +256,19 @@ class MarketDataCollector:
     
     async def _log_start(self, process_type: str) -> int:
         """Log the start of a data ingestion process"""
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_write_session() as session:
             log_entry = DataIngestionLog(
                 process_type=process_type,
                 status='started',
                 start_time=datetime.now()
             )
             session.add(log_entry)
-            await session.commit()
-            await session.refresh(log_entry)
+            await session.flush()  # Get the ID
             return log_entry.id
     
     async def _log_completion(self, log_id: int, records_processed: int):
         """Log the completion of a data ingestion process"""
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_write_session() as session:
             stmt = (
                 update(DataIngestionLog)
                 .where(DataIngestionLog.id == log_id)
@@ -289,7 +283,7 @@ class MarketDataCollector:
     
     async def _log_error(self, log_id: int, error_message: str):
         """Log an error in data ingestion process"""
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_write_session() as session:
             stmt = (
                 update(DataIngestionLog)
                 .where(DataIngestionLog.id == log_id)
@@ -9,16 +9,17 @@ import asyncio
 import re
 from urllib.parse import urlparse
 from newsapi import NewsApiClient
-from sqlalchemy import select, insert
+from sqlalchemy import insert, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from ..database.database import db_manager
-from ..database.models import NewsArticle, NewsStockMention, Stock, DataIngestionLog
-from ..utils.logger import get_pipeline_logger
+from ..database.database import get_db_manager
+from ..database.bulk import bulk_insert_news
+from ..database.models import DataIngestionLog, url_hash
+from ..utils.logger import get_news_logger
 from .lq45_stocks import LQ45_STOCKS, clean_idx_symbol
 from ..config.settings import config
 
-logger = get_pipeline_logger()
+logger = get_news_logger()
 
 class NewsDataCollector:
     """Collect and store financial news data"""
@@ -106,51 +107,43 @@ class NewsDataCollector:
                 'Bursa Efek Indonesia'
             ]
             
-            async with db_manager.get_async_session() as session:
-                for keyword in keywords:
-                    try:
-                        # Get articles from NewsAPI
-                        articles = self.newsapi_client.get_everything(
-                            q=keyword,
-                            language='id',  # Indonesian
-                            from_param=start_date.strftime('%Y-%m-%d'),
-                            to=end_date.strftime('%Y-%m-%d'),
-                            sort_by='publishedAt',
-                            page_size=50
-                        )
-                        
-                        if articles['status'] != 'ok':
-                            logger.error(f"NewsAPI error: {articles.get('message', 'Unknown error')}")
-                            continue
-                        
-                        for article_data in articles['articles']:
-                            try:
-                                # Check if article already exists
-                                existing = await self._check_article_exists(session, article_data['url'])
-                                if existing:
-                                    continue
-                                
-                                # Create news article
-                                article = await self._create_news_article(
-                                    session,
-                                    article_data,
-                                    'NewsAPI'
-                                )
-                                
-                                if article:
-                                    results['total_records'] += 1
-                                    results['success'] += 1
-                                
-                            except Exception as e:
-                                logger.error(f"Error processing NewsAPI article: {e}")
-                                results['failed'] += 1
-                                continue
-                        
-                        await session.commit()
-                        
-                    except Exception as e:
-                        logger.error(f"Error fetching NewsAPI data for keyword '{keyword}': {e}")
+            for keyword in keywords:
+                try:
+                    # Get articles from NewsAPI
+                    articles = self.newsapi_client.get_everything(
+                        q=keyword,
+                        language='id',  # Indonesian
+                        from_param=start_date.strftime('%Y-%m-%d'),
+                        to=end_date.strftime('%Y-%m-%d'),
+                        sort_by='publishedAt',
+                        page_size=50
+                    )
+                    
+                    if articles['status'] != 'ok':
+                        logger.error(f"NewsAPI error: {articles.get('message', 'Unknown error')}")
                         continue
+                    
+                    article_rows = []
+                    for article_data in articles['articles']:
+                        try:
+                            # Create news article row
+                            row = await self._build_article_row(article_data, 'NewsAPI')
+                            if row:
+                                article_rows.append(row)
+                            
+                        except Exception as e:
+                            logger.error(f"Error processing NewsAPI article: {e}")
+                            results['failed'] += 1
+                            continue
+                    
+                    # Articles already stored are skipped by the insert's conflict clause
+                    inserted = await bulk_insert_news(article_rows)
+                    results['total_records'] += inserted
+                    results['success'] += inserted
+                    
+                except Exception as e:
+                    logger.error(f"Error fetching NewsAPI data for keyword '{keyword}': {e}")
+                    continue
             
             await self._log_completion(session_id, results['total_records'])
             logger.info(f"NewsAPI collection completed. Success: {results['success']}, Failed: {results['failed']}, Total records: {results['total_records']}")
@@ -177,66 +170,60 @@ class NewsDataCollector:
             
             cutoff_date = datetime.now() - timedelta(days=days_back)
             
-            async with db_manager.get_async_session() as session:
-                for feed_config in self.rss_feeds:
-                    try:
-                        logger.info(f"Processing RSS feed: {feed_config['source']}")
-                        
-                        # Parse RSS feed
-                        feed = feedparser.parse(feed_config['url'])
-                        
-                        if feed.bozo:
-                            logger.warning(f"RSS feed parsing warning for {feed_config['source']}: {feed.bozo_exception}")
-                        
-                        for entry in feed.entries:
-                            try:
-                                # Parse publication date
-                                published_at = self._parse_rss_date(entry)
-                                if not published_at or published_at < cutoff_date:
-                                    continue
-                                
-                                # Check if article already exists
-                                article_url = entry.get('link', entry.get('id', ''))
-                                if not article_url:
-                                    continue
-                                
-                                existing = await self._check_article_exists(session, article_url)
-                                if existing:
-                                    continue
-                                
-                                # Create article data structure
-                                article_data = {
-                                    'title': entry.get('title', ''),
-                                    'description': entry.get('summary', entry.get('description', '')),
-                                    'url': article_url,
-                                    'publishedAt': published_at.isoformat(),
-                                    'author': entry.get('author', ''),
-                                    'content': entry.get('content', [{}])[0].get('value', '') if entry.get('content') else ''
-                                }
-                                
-                                # Create news article
-                                article = await self._create_news_article(
-                                    session,
-                                    article_data,
-                                    feed_config['source'],
-                                    category=feed_config['category']
-                                )
-                                
-                                if article:
-                                    results['total_records'] += 1
-                                
-                            except Exception as e:
-                                logger.error(f"Error processing RSS article from {feed_config['source']}: {e}")
-                                results['failed'] += 1
+            for feed_config in self.rss_feeds:
+                try:
+                    logger.info(f"Processing RSS feed: {feed_config['source']}")
+                    
+                    # Parse RSS feed
+                    feed = feedparser.parse(feed_config['url'])
+                    
+                    if feed.bozo:
+                        logger.warning(f"RSS feed parsing warning for {feed_config['source']}: {feed.bozo_exception}")
+                    
+                    article_rows = []
+                    for entry in feed.entries:
+                        try:
+                            # Parse publication date
+                            published_at = self._parse_rss_date(entry)
+                            if not published_at or published_at < cutoff_date:
                                 continue
-                        
-                        await session.commit()
-                        results['success'] += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing RSS feed {feed_config['source']}: {e}")
-                        results['failed'] += 1
-                        continue
+                            
+                            article_url = entry.get('link', entry.get('id', ''))
+                            if not article_url:
+                                continue
+                            
+                            # Create article data structure
+                            article_data = {
+                                'title': entry.get('title', ''),
+                                'description': entry.get('summary', entry.get('description', '')),
+                                'url': article_url,
+                                'publishedAt': published_at.isoformat(),
+                                'author': entry.get('author', ''),
+                                'content': entry.get('content', [{}])[0].get('value', '') if entry.get('content') else ''
+                            }
+                            
+                            # Create news article row
+                            row = await self._build_article_row(
+                                article_data,
+                                feed_config['source'],
+                                category=feed_config['category']
+                            )
+                            if row:
+                                article_rows.append(row)
+                            
+                        except Exception as e:
+                            logger.error(f"Error processing RSS article from {feed_config['source']}: {e}")
+                            results['failed'] += 1
+                            continue
+                    
+                    # Articles already stored are skipped by the insert's conflict clause
+                    results['total_records'] += await bulk_insert_news(article_rows)
+                    results['success'] += 1
+                    
+                except Exception as e:
+                    logger.error(f"Error processing RSS feed {feed_config['source']}: {e}")
+                    results['failed'] += 1
+                    continue
             
             await self._log_completion(session_id, results['total_records'])
             logger.info(f"RSS collection completed. Success: {results['success']}, Failed: {results['failed']}, Total records: {results['total_records']}")
@@ -248,8 +235,8 @@ class NewsDataCollector:
             logger.error(f"RSS collection failed: {e}")
             raise
     
-    async def _create_news_article(self, session, article_data: Dict, source: str, category: str = 'market') -> Optional[NewsArticle]:
-        """Create a news article record"""
+    async def _build_article_row(self, article_data: Dict, source: str, category: str = 'market') -> Optional[Dict]:
+        """Build a news_articles row, with its stock mentions, for bulk_insert_news"""
         try:
             # Parse published date
             published_at = datetime.fromisoformat(
@@ -261,39 +248,31 @@ class NewsDataCollector:
                 article_data.get('title', '') + ' ' + article_data.get('description', '')
             )
             
-            # Create article
-            article = NewsArticle(
-                title=article_data.get('title', '')[:500],  # Limit title length
-                content=article_data.get('content', ''),
-                summary=article_data.get('description', '')[:1000],  # Limit summary length
-                url=article_data['url'],
-                source=source,
-                author=article_data.get('author', ''),
-                published_at=published_at,
-                category=category,
-                relevance_score=relevance_score,
-                language='id',  # Indonesian
-                is_processed=False
-            )
-            
-            session.add(article)
-            await session.flush()  # Get the ID
+            # Create article row
+            row = {
+                'title': article_data.get('title', '')[:500],  # Limit title length
+                'content': article_data.get('content', ''),
+                'summary': article_data.get('description', '')[:1000],  # Limit summary length
+                'url': article_data['url'],
+                'url_hash': url_hash(article_data['url']),
+                'source': source,
+                'author': article_data.get('author', ''),
+                'published_at': published_at,
+                'category': category,
+                'relevance_score': relevance_score,
+                'language': 'id',  # Indonesian
+                'is_processed': False
+            }
             
-            # Find stock mentions
-            await self._find_stock_mentions(session, article)
+            # Find stock mentions; they are written with the article's id
+            row['stock_mentions'] = await self._find_stock_mentions(row)
             
-            return article
+            return row
             
         except Exception as e:
             logger.error(f"Error creating news article: {e}")
             return None
     
-    async def _check_article_exists(self, session, url: str) -> bool:
-        """Check if article with URL already exists"""
-        stmt = select(NewsArticle).where(NewsArticle.url == url)
-        result = await session.execute(stmt)
-        return result.scalar_one_or_none() is not None
-    
     def _calculate_relevance_score(self, text: str) -> float:
         """Calculate relevance score based on keyword matching"""
         if not text:
@@ -312,9 +291,9 @@ class NewsDataCollector:
         
         return round(score, 2)
     
-    async def _find_stock_mentions(self, session, article: NewsArticle):
-        """Find and record stock mentions in article"""
-        text = f"{article.title} {article.summary} {article.content}".lower()
+    async def _find_stock_mentions(self, article: Dict) -> List[Dict]:
+        """Find stock mentions in an article row"""
+        text = f"{article['title']} {article['summary']} {article['content']}".lower()
         
         mentioned_stocks = set()
         
@@ -322,29 +301,28 @@ class NewsDataCollector:
             if keyword in text:
                 mentioned_stocks.add(symbol)
         
-        # Create stock mention records
+        # Build stock mention rows
+        mentions = []
         for symbol in mentioned_stocks:
             try:
                 # Get stock ID
-                stmt = select(Stock).where(Stock.symbol == symbol)
-                result = await session.execute(stmt)
-                stock = result.scalar_one_or_none()
+                stock_id = await get_db_manager().get_stock_id(symbol)
                 
-                if stock:
+                if stock_id is not None:
                     # Count mentions
                     mention_count = text.count(keyword.lower())
                     
-                    mention = NewsStockMention(
-                        news_article_id=article.id,
-                        stock_id=stock.id,
-                        mention_count=mention_count,
-                        sentiment_impact=0.0  # Will be calculated later by sentiment analysis
-                    )
-                    session.add(mention)
+                    mentions.append({
+                        'stock_id': stock_id,
+                        'mention_count': mention_count,
+                        'sentiment_impact': 0.0  # Will be calculated later by sentiment analysis
+                    })
                     
             except Exception as e:
                 logger.error(f"Error creating stock mention for {symbol}: {e}")
                 continue
+        
+        return mentions
     
     def _parse_rss_date(self, entry) -> Optional[datetime]:
         """Parse publication date from RSS entry"""
@@ -379,20 +357,19 @@ class NewsDataCollector:
     
     async def _log_start(self, process_type: str) -> int:
         """Log the start of a data ingestion process"""
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_write_session() as session:
             log_entry = DataIngestionLog(
                 process_type=process_type,
                 status='started',
                 start_time=datetime.now()
             )
             session.add(log_entry)
-            await session.commit()
-            await session.refresh(log_entry)
+            await session.flush()  # Get the ID
             return log_entry.id
     
     async def _log_completion(self, log_id: int, records_processed: int):
         """Log the completion of a data ingestion process"""
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_write_session() as session:
             stmt = (
                 update(DataIngestionLog)
                 .where(DataIngestionLog.id == log_id)
@@ -407,7 +384,7 @@ class NewsDataCollector:
     
     async def _log_error(self, log_id: int, error_message: str):
         """Log an error in data ingestion process"""
-        async with db_manager.get_async_session() as session:
+        async with get_db_manager().get_write_session() as session:
             stmt = (
                 update(DataIngestionLog)
                 .where(DataIngestionLog.id == log_id)
@@ -8,26 +8,80 @@ from datetime import datetime, timedelta
 from typing import Dict, Any
 import signal
 import sys
+from urllib.parse import urlparse
 
 from .market_data import MarketDataCollector
 from .news_data import NewsDataCollector
-from ..analysis.quantitative import QuantitativeAnalyzer
-from ..analysis.qualitative import QualitativeAnalyzer
-from ..database.database import init_database
+from ..database.database import init_database, get_db_manager
 from ..utils.logger import get_pipeline_logger
 from ..config.settings import config
 
 logger = get_pipeline_logger()
 
+# NewsAPI collection is skipped outright when no key is configured
+_HAS_NEWSAPI = bool(config.NEWS_API_KEY)
+_EMPTY_COLLECTION_RESULT = {'success': 0, 'failed': 0, 'total_records': 0}
+
+# Remote hosts hit by the collectors (RSS hosts are added from the feed list)
+_YAHOO_HOSTS = ('query1.finance.yahoo.com', 'query2.finance.yahoo.com')
+_NEWSAPI_HOST = 'newsapi.org'
+
+# Health check looks for successful ingestion runs inside this window
+_HEALTH_WINDOW = timedelta(days=2)
+_HEALTH_STMT = None
+
+def _get_health_stmt():
+    """Build the recent-successful-runs count statement once and reuse it"""
+    global _HEALTH_STMT
+    if _HEALTH_STMT is None:
+        from sqlalchemy import select, func, bindparam
+        from ..database.models import DataIngestionLog
+        
+        _HEALTH_STMT = select(func.count(DataIngestionLog.id)).where(
+            DataIngestionLog.start_time >= bindparam('cutoff_date', type_=DataIngestionLog.start_time.type),
+            DataIngestionLog.status == 'completed'
+        )
+    return _HEALTH_STMT
+
 class DataPipeline:
     """Main data pipeline orchestrator"""
     
+    __slots__ = (
+        'market_collector', 'news_collector',
+        'quantitative_analyzer', 'qualitative_analyzer',
+        'running', '_stop_event',
+        '_collect_prices', '_collect_financials', '_collect_news_api', '_collect_rss'
+    )
+    
     def __init__(self):
         self.market_collector = MarketDataCollector()
         self.news_collector = NewsDataCollector()
-        self.quantitative_analyzer = QuantitativeAnalyzer()
-        self.qualitative_analyzer = QualitativeAnalyzer()
+        # Analyzers are created on first use; their modules pull in
+        # pandas/numpy and the Gemini SDK
+        self.quantitative_analyzer = None
+        self.qualitative_analyzer = None
         self.running = False
+        self._stop_event = None
+        
+        # Bind collector entry points once; scheduled jobs reuse them
+        self._collect_prices = self.market_collector.collect_daily_prices
+        self._collect_financials = self.market_collector.collect_financial_statements
+        self._collect_news_api = self.news_collector.collect_newsapi_articles
+        self._collect_rss = self.news_collector.collect_rss_articles
+    
+    def _get_quant(self):
+        """Get the quantitative analyzer, importing it on first use"""
+        if self.quantitative_analyzer is None:
+            from ..analysis.quantitative import QuantitativeAnalyzer
+            self.quantitative_analyzer = QuantitativeAnalyzer()
+        return self.quantitative_analyzer
+    
+    def _get_qual(self):
+        """Get the qualitative analyzer, importing it on first use"""
+        if self.qualitative_analyzer is None:
+            from ..analysis.qualitative import QualitativeAnalyzer
+            self.qualitative_analyzer = QualitativeAnalyzer()
+        return self.qualitative_analyzer
     
     async def initialize(self):
         """Initialize the data pipeline"""
@@ -40,6 +94,9 @@ class DataPipeline:
             # Initialize stocks
             await self.market_collector.initialize_stocks()
             
+            # Resolve collector hosts up front so scheduled jobs start warm
+            await self._warm_dns()
+            
             logger.info("Data pipeline initialization completed successfully")
             return True
             
@@ -47,12 +104,28 @@ class DataPipeline:
             logger.error(f"Data pipeline initialization failed: {e}")
             return False
     
+    async def _warm_dns(self):
+        """Pre-resolve the hosts used by the collectors (best effort)"""
+        hosts = set(_YAHOO_HOSTS)
+        if _HAS_NEWSAPI:
+            hosts.add(_NEWSAPI_HOST)
+        hosts.update(urlparse(feed['url']).hostname for feed in self.news_collector.rss_feeds)
+        hosts.discard(None)
+        
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.getaddrinfo(host, 443) for host in hosts),
+            return_exceptions=True
+        )
+        failed = sum(isinstance(r, Exception) for r in results)
+        logger.info(f"DNS warmup resolved {len(results) - failed}/{len(results)} hosts")
+    
     async def run_daily_market_data_collection(self):
         """Run daily market data collection"""
         logger.info("Starting scheduled market data collection")
         
         try:
-            results = await self.market_collector.collect_daily_prices(days_back=1)
+            results = await self._collect_prices(days_back=1)
             logger.info(f"Market data collection completed: {results}")
             return results
             
@@ -66,8 +139,11 @@ class DataPipeline:
         
         try:
             # Collect from both NewsAPI and RSS feeds
-            newsapi_results = await self.news_collector.collect_newsapi_articles(days_back=1)
-            rss_results = await self.news_collector.collect_rss_articles(days_back=1)
+            if _HAS_NEWSAPI:
+                newsapi_results = await self._collect_news_api(days_back=1)
+            else:
+                newsapi_results = _EMPTY_COLLECTION_RESULT
+            rss_results = await self._collect_rss(days_back=1)
             
             # Combine results
             total_results = {
@@ -88,7 +164,7 @@ class DataPipeline:
         logger.info("Starting scheduled financial statements collection")
         
         try:
-            results = await self.market_collector.collect_financial_statements()
+            results = await self._collect_financials()
             logger.info(f"Financial statements collection completed: {results}")
             return results
             
@@ -101,24 +177,18 @@ class DataPipeline:
         logger.info("Running data pipeline health check")
         
         try:
-            from ..database.database import db_manager
+            db_manager = get_db_manager()
             
             # Check database connection
             db_healthy = await db_manager.check_connection()
             
             # Check recent data ingestion
-            from sqlalchemy import select, func
-            from ..database.models import DataIngestionLog
+            stmt = _get_health_stmt()
             
             async with db_manager.get_async_session() as session:
                 # Check for successful runs in the last 2 days
-                cutoff_date = datetime.now() - timedelta(days=2)
-                
-                stmt = select(func.count(DataIngestionLog.id)).where(
-                    DataIngestionLog.start_time >= cutoff_date,
-                    DataIngestionLog.status == 'completed'
-                )
-                result = await session.execute(stmt)
+                cutoff_date = datetime.now() - _HEALTH_WINDOW
+                result = await session.execute(stmt, {'cutoff_date': cutoff_date})
                 recent_successful_runs = result.scalar()
             
             health_status = {
@@ -146,7 +216,8 @@ class DataPipeline:
         logger.info("Starting scheduled quantitative analysis")
         
         try:
-            results = await self.quantitative_analyzer.run_quantitative_analysis()
+            results = await self._get_quant().run_quantitative_analysis()
+            await get_db_manager().refresh_rollup_view('quantitative_scores_weekly')
             logger.info(f"Quantitative analysis completed: {results}")
             return results
             
@@ -159,7 +230,8 @@ class DataPipeline:
         logger.info("Starting scheduled qualitative analysis")
         
         try:
-            results = await self.qualitative_analyzer.run_qualitative_analysis(hours_back=24)
+            results = await self._get_qual().run_qualitative_analysis(hours_back=24)
+            await get_db_manager().refresh_rollup_view('sentiment_daily')
             logger.info(f"Qualitative analysis completed: {results}")
             return results
             
@@ -172,11 +244,12 @@ class DataPipeline:
         logger.info("Starting combined analysis workflow")
         
         try:
-            # Run quantitative analysis first
-            quant_results = await self.run_quantitative_analysis()
-            
-            # Run qualitative analysis 
-            qual_results = await self.run_qualitative_analysis()
+            # The two engines read disjoint data (prices vs. news), so run
+            # them side by side rather than back to back
+            quant_results, qual_results = await asyncio.gather(
+                self.run_quantitative_analysis(),
+                self.run_qualitative_analysis()
+            )
             
             combined_results = {
                 'quantitative': quant_results,
@@ -197,61 +270,86 @@ class DataPipeline:
         
         # Market data collection after IDX close (4:30 PM WIB = 9:30 UTC)
         schedule.every().day.at(config.LQ45_UPDATE_TIME).do(
-            lambda: asyncio.create_task(self.run_daily_market_data_collection())
+            self.run_daily_market_data_collection
         )
         
         # News data collection after market close (4:45 PM WIB = 9:45 UTC)
         schedule.every().day.at(config.NEWS_UPDATE_TIME).do(
-            lambda: asyncio.create_task(self.run_daily_news_collection())
+            self.run_daily_news_collection
         )
         
         # PHASE 2: Analysis workflow after data collection
         # Quantitative analysis at 5:00 PM WIB (10:00 UTC)
         schedule.every().day.at("10:00").do(
-            lambda: asyncio.create_task(self.run_quantitative_analysis())
+            self.run_quantitative_analysis
         )
         
         # Qualitative analysis at 5:15 PM WIB (10:15 UTC)
         schedule.every().day.at("10:15").do(
-            lambda: asyncio.create_task(self.run_qualitative_analysis())
+            self.run_qualitative_analysis
         )
         
         # Financial statements collection weekly on Sundays
         schedule.every().sunday.at("10:00").do(
-            lambda: asyncio.create_task(self.run_weekly_financial_statements_collection())
+            self.run_weekly_financial_statements_collection
         )
         
         # Health check every 6 hours
         schedule.every(6).hours.do(
-            lambda: asyncio.create_task(self.run_health_check())
+            self.run_health_check
         )
         
         logger.info("Enhanced schedule setup completed with analysis workflows")
     
+    async def _run_pending_jobs(self):
+        """Run due scheduled jobs, awaiting each job's coroutine inline"""
+        for job in sorted(job for job in schedule.jobs if job.should_run):
+            result = job.run()
+            if asyncio.iscoroutine(result):
+                await result
+    
+    def _shutdown(self, signum=None):
+        """Stop the scheduler loop, waking it immediately"""
+        if signum is not None:
+            logger.info(f"Received signal {signum}, shutting down gracefully...")
+        self.running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+    
     async def start_scheduler(self):
         """Start the scheduled data pipeline"""
         logger.info("Starting data pipeline scheduler")
         
         self.running = True
+        self._stop_event = asyncio.Event()
         
-        # Setup signal handlers for graceful shutdown
-        def signal_handler(signum, frame):
-            logger.info(f"Received signal {signum}, shutting down gracefully...")
-            self.running = False
-        
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        # Setup signal handlers for graceful shutdown; the event loop wakes
+        # on the signal itself instead of at the next poll
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._shutdown, sig)
         
         self.setup_schedule()
         
         try:
             while self.running:
-                schedule.run_pending()
-                await asyncio.sleep(60)  # Check every minute
+                await self._run_pending_jobs()
+                
+                # Sleep until the next job is due or a shutdown is requested
+                next_delay = schedule.idle_seconds()
+                if next_delay is None:
+                    next_delay = 60
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=max(next_delay, 0))
+                except asyncio.TimeoutError:
+                    pass
                 
         except Exception as e:
             logger.error(f"Scheduler error: {e}")
             self.running = False
+        finally:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sig)
         
         logger.info("Data pipeline scheduler stopped")
     
@@ -289,23 +387,63 @@ class DataPipeline:
             raise
 
 # CLI interface
-async def main():
-    """Main function for CLI usage"""
+_COMMANDS = (
+    'init', 'run', 'schedule', 'health', 'collect', 
+    'analyze-quantitative', 'analyze-qualitative', 'analyze-all'
+)
+_TYPES = (
+    'all', 'market', 'news', 'financials', 
+    'analyze-quantitative', 'analyze-qualitative', 'analyze-all'
+)
+_VALID_COMMANDS = frozenset(_COMMANDS)
+_VALID_TYPES = frozenset(_TYPES)
+
+def _build_parser():
+    """Build the full argparse parser (used for --help and invalid input)"""
     import argparse
     
     parser = argparse.ArgumentParser(description="AlphaGen Data Pipeline with Analysis Engine")
-    parser.add_argument('command', choices=[
-        'init', 'run', 'schedule', 'health', 'collect', 
-        'analyze-quantitative', 'analyze-qualitative', 'analyze-all'
-    ], help='Command to execute')
-    parser.add_argument('--type', choices=[
-        'all', 'market', 'news', 'financials', 
-        'analyze-quantitative', 'analyze-qualitative', 'analyze-all'
-    ], default='all', help='Type of operation to run')
+    parser.add_argument('command', choices=_COMMANDS, help='Command to execute')
+    parser.add_argument('--type', choices=_TYPES, default='all',
+                       help='Type of operation to run')
     parser.add_argument('--days', type=int, default=1, 
                        help='Number of days back to collect data')
+    return parser
+
+def _parse_args(argv):
+    """Parse CLI arguments, falling back to argparse for anything unusual"""
+    from types import SimpleNamespace
+    
+    if not argv or argv[0] not in _VALID_COMMANDS:
+        return _build_parser().parse_args(argv)
+    
+    args = SimpleNamespace(command=argv[0], type='all', days=1)
+    rest = argv[1:]
+    i = 0
+    try:
+        while i < len(rest):
+            option, _, value = rest[i].partition('=')
+            if option not in ('--type', '--days'):
+                raise ValueError(option)
+            if not value:
+                i += 1
+                value = rest[i]
+            if option == '--type':
+                if value not in _VALID_TYPES:
+                    raise ValueError(value)
+                args.type = value
+            else:
+                args.days = int(value)
+            i += 1
+    except (IndexError, ValueError):
+        # Let argparse produce the usual usage/error message
+        return _build_parser().parse_args(argv)
     
-    args = parser.parse_args()
+    return args
+
+async def main():
+    """Main function for CLI usage"""
+    args = _parse_args(sys.argv[1:])
     
     pipeline = DataPipeline()
     
@@ -0,0 +1,84 @@
+"""
+Batched Core inserts for ingestion tables
+"""
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .database import get_db_manager
+from .models import FinancialStatement, NewsArticle, NewsStockMention
+
+# Rows per execute() call and per multi-row VALUES page
+BULK_PAGE_SIZE = 10_000
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Yield lists of at most size rows from any iterable"""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+async def insert_ignoring_conflicts(table: Table, constraint: str, rows: Iterable[Dict[str, Any]]) -> int:
+    """Insert rows with ON CONFLICT DO NOTHING, returning the number actually inserted"""
+    stmt = (
+        pg_insert(table)
+        .on_conflict_do_nothing(constraint=constraint)
+        .returning(table.c.id)
+    )
+    inserted = 0
+    
+    async with get_db_manager().write_engine.begin() as conn:
+        for batch in _batches(rows, BULK_PAGE_SIZE):
+            result = await conn.execute(
+                stmt, batch,
+                execution_options={'insertmanyvalues_page_size': BULK_PAGE_SIZE}
+            )
+            inserted += len(result.all())
+    
+    return inserted
+
+async def bulk_upsert_financial_statements(rows: Iterable[Dict[str, Any]]) -> int:
+    """Insert statement rows, skipping periods that are already stored"""
+    return await insert_ignoring_conflicts(FinancialStatement.__table__, 'uq_financial_statement', rows)
+
+async def bulk_insert_news(rows: Iterable[Dict[str, Any]]) -> int:
+    """Insert article rows and their stock mentions, skipping URLs already stored
+    
+    Each row may carry a 'stock_mentions' list of mention column dicts
+    (without news_article_id); they are written for the articles that were
+    actually inserted, in the same transaction.
+    """
+    articles = NewsArticle.__table__
+    mentions = NewsStockMention.__table__
+    article_stmt = (
+        pg_insert(articles)
+        .on_conflict_do_nothing(constraint='uq_news_url_hash')
+        .returning(articles.c.id, articles.c.url_hash)
+    )
+    mention_stmt = pg_insert(mentions).on_conflict_do_nothing(constraint='uq_news_stock_mention')
+    options = {'insertmanyvalues_page_size': BULK_PAGE_SIZE}
+    inserted = 0
+    
+    async with get_db_manager().write_engine.begin() as conn:
+        for batch in _batches(rows, BULK_PAGE_SIZE):
+            mentions_by_hash = {row['url_hash']: row.get('stock_mentions', ()) for row in batch}
+            article_rows = [
+                {key: value for key, value in row.items() if key != 'stock_mentions'}
+                for row in batch
+            ]
+            
+            result = await conn.execute(article_stmt, article_rows, execution_options=options)
+            new_articles = result.all()
+            inserted += len(new_articles)
+            
+            # Conflicting URLs return no row, so their mentions are skipped too
+            mention_rows = [
+                {'news_article_id': article_id, **mention}
+                for article_id, article_hash in new_articles
+                for mention in mentions_by_hash[article_hash]
+            ]
+            if mention_rows:
+                await conn.execute(mention_stmt, mention_rows, execution_options=options)
+    
+    return inserted
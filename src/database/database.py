@@ -1,19 +1,223 @@
 """
 Database connection and utilities for AlphaGen Investment Platform
 """
-from sqlalchemy import create_engine, text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from sqlalchemy.orm import sessionmaker, scoped_session
 from contextlib import contextmanager, asynccontextmanager
-from typing import Generator, AsyncGenerator
+from typing import Generator, AsyncGenerator, Dict, Iterable, NamedTuple, Optional, Sequence
 import asyncio
+import json
+import time
+from datetime import datetime
+from functools import lru_cache
+
+import asyncpg
 
 from ..config.settings import config
 from ..utils.logger import get_logger
-from .models import Base
+from .models import Base, Stock
 
 logger = get_logger(__name__)
 
+# Connections kept open per engine
+SYNC_POOL_SIZE = 10
+ASYNC_POOL_SIZE = 20
+WRITE_POOL_SIZE = 5
+
+# Connections opened per engine by prewarm (capped by what the pool has free)
+PREWARM_CONNECTIONS = 5
+
+class PriceRow(NamedTuple):
+    """One stock_prices row as COPYed by bulk_insert_stock_prices"""
+    stock_id: int
+    trade_date: datetime
+    open_price: float
+    high_price: float
+    low_price: float
+    close_price: float
+    volume: int
+    adjusted_close: Optional[float]
+
+# Column order used when COPYing price rows into stock_prices
+# (created_at is filled in by its server default)
+STOCK_PRICE_COLUMNS = PriceRow._fields
+
+# bulk_insert uses executemany below this many rows and COPY above it,
+# COPYing in chunks of BULK_CHUNK_SIZE to cap memory
+COPY_THRESHOLD = 100
+BULK_CHUNK_SIZE = 10000
+
+# Session settings for the ingestion pool, sent in the startup packet so
+# new connections don't need extra SET round trips. Ingestion queries are
+# short, so JIT compilation only adds latency, and local commit skips
+# waiting on replicas.
+INGEST_SERVER_SETTINGS = {
+    'jit': 'off',
+    'synchronous_commit': 'local',
+    'timezone': 'UTC',
+}
+
+# Seconds the in-process symbol -> stock id map is reused before reloading
+STOCK_ID_CACHE_TTL = 30.0
+
+# Prepared statements kept per ingestion connection
+INGEST_STATEMENT_CACHE_SIZE = 256
+
+async def _init_pg_connection(conn: asyncpg.Connection):
+    """Per-connection setup for the asyncpg ingestion pool"""
+    for json_type in ('json', 'jsonb'):
+        await conn.set_type_codec(
+            json_type,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema='pg_catalog'
+        )
+
+# TimescaleDB setup steps as (description, statement) pairs
+HYPERTABLE_STEPS = [
+    # The BRIN and covering (stock_id, trade_date) indexes replace the
+    # default btree time index
+    ("stock_prices hypertable", f"""
+    SELECT create_hypertable(
+        'stock_prices', 
+        'trade_date',
+        chunk_time_interval => INTERVAL '{config.STOCK_PRICE_CHUNK_INTERVAL}',
+        create_default_indexes => FALSE,
+        migrate_data => TRUE,
+        if_not_exists => TRUE
+    );
+    """),
+    # Applies a changed setting to new chunks of an existing hypertable
+    ("stock_prices chunk interval", f"""
+    SELECT set_chunk_time_interval('stock_prices', INTERVAL '{config.STOCK_PRICE_CHUNK_INTERVAL}');
+    """),
+    # Every column of a unique index (the (id, trade_date) primary key and
+    # uq_stock_price_date) must be in segmentby or orderby
+    ("stock_prices compression", """
+    ALTER TABLE stock_prices SET (
+        timescaledb.compress,
+        timescaledb.compress_segmentby = 'stock_id',
+        timescaledb.compress_orderby = 'trade_date DESC, id'
+    );
+    """),
+    ("stock_prices compression policy", f"""
+    SELECT add_compression_policy('stock_prices', INTERVAL '{config.STOCK_PRICE_COMPRESS_AFTER}', if_not_exists => TRUE);
+    """),
+    # The BRIN index on start_time replaces the default btree time index
+    ("data_ingestion_logs hypertable", f"""
+    SELECT create_hypertable(
+        'data_ingestion_logs',
+        'start_time',
+        chunk_time_interval => INTERVAL '{config.INGESTION_LOG_CHUNK_INTERVAL}',
+        create_default_indexes => FALSE,
+        migrate_data => TRUE,
+        if_not_exists => TRUE
+    );
+    """),
+    # Old logs are dropped a whole chunk at a time
+    ("data_ingestion_logs retention policy", f"""
+    SELECT add_retention_policy('data_ingestion_logs', INTERVAL '{config.INGESTION_LOG_RETENTION}', if_not_exists => TRUE);
+    """),
+]
+
+# Prices are daily, so the rollup is weekly
+AGGREGATE_STEPS = [
+    ("stock_prices_weekly continuous aggregate", """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS stock_prices_weekly
+    WITH (timescaledb.continuous) AS
+    SELECT
+        stock_id,
+        time_bucket(INTERVAL '7 days', trade_date) AS bucket,
+        first(open_price, trade_date) AS open_price,
+        max(high_price) AS high_price,
+        min(low_price) AS low_price,
+        last(close_price, trade_date) AS close_price,
+        sum(volume) AS volume
+    FROM stock_prices
+    GROUP BY stock_id, bucket
+    WITH NO DATA;
+    """),
+    ("stock_prices_weekly refresh policy", """
+    SELECT add_continuous_aggregate_policy('stock_prices_weekly',
+        start_offset => INTERVAL '3 months',
+        end_offset => INTERVAL '1 day',
+        schedule_interval => INTERVAL '1 day',
+        if_not_exists => TRUE);
+    """),
+]
+
+# Undoes the stock_prices compression and weekly rollup so hypertable
+# columns can change type; setup_hypertables() and
+# setup_continuous_aggregates() recreate them
+TIMESCALE_TEARDOWN_STEPS = [
+    ("stock_prices_weekly drop", "DROP MATERIALIZED VIEW IF EXISTS stock_prices_weekly;"),
+    ("stock_prices compression policy removal", "SELECT remove_compression_policy('stock_prices', if_exists => TRUE);"),
+    ("stock_prices decompression", "SELECT decompress_chunk(c, if_compressed => TRUE) FROM show_chunks('stock_prices') c;"),
+    ("stock_prices compression disable", "ALTER TABLE stock_prices SET (timescaledb.compress = false);"),
+]
+
+# Score rollups. The source tables aren't hypertables, so these are plain
+# materialized views refreshed after each analysis run; the unique
+# indexes allow REFRESH ... CONCURRENTLY
+ROLLUP_VIEW_STEPS = [
+    ("quantitative_scores_weekly view", """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS quantitative_scores_weekly AS
+    SELECT
+        stock_id,
+        date_trunc('week', analysis_date) AS bucket,
+        avg(composite_score) AS avg_composite_score,
+        avg(rsi) AS avg_rsi,
+        (array_agg(ma_signal ORDER BY analysis_date DESC))[1] AS last_ma_signal,
+        count(*) AS score_days
+    FROM quantitative_scores
+    GROUP BY stock_id, bucket;
+    """),
+    ("quantitative_scores_weekly index", """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_quantitative_scores_weekly
+    ON quantitative_scores_weekly (stock_id, bucket);
+    """),
+    ("sentiment_daily view", """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS sentiment_daily AS
+    SELECT
+        date_trunc('day', created_at) AS bucket,
+        avg(sentiment_score) AS avg_sentiment,
+        avg(sentiment_score) FILTER (WHERE confidence > 0.5) AS avg_confident_sentiment,
+        avg(confidence) AS avg_confidence,
+        count(*) AS analyses
+    FROM sentiment_analysis
+    GROUP BY bucket;
+    """),
+    ("sentiment_daily index", """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_sentiment_daily ON sentiment_daily (bucket);
+    """),
+]
+
+# Score tables rewritten per symbol every day: leave page room for HOT
+# updates and vacuum/analyze them well before the 20%/10% defaults
+UPSERT_TABLE_STORAGE = (
+    "fillfactor = 80, "
+    "autovacuum_vacuum_scale_factor = 0.05, "
+    "autovacuum_analyze_scale_factor = 0.02"
+)
+UPSERT_TABLES = ['quantitative_scores', 'daily_recommendations']
+
+# Tables whose updated_at is maintained by the set_updated_at() trigger,
+# so bulk UPDATE statements bump it too
+UPDATED_AT_TABLES = ['stocks', 'financial_statements', 'news_articles', 'portfolios']
+
+UPDATED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# pg_advisory_xact_lock key that serialises concurrent init_database runs
+INIT_LOCK_KEY = 0x416C7068
+
 class DatabaseManager:
     """Database connection and session management"""
     
@@ -21,34 +225,69 @@ class DatabaseManager:
         # Synchronous engine for migrations and setup
         self.sync_engine = create_engine(
             config.database_url,
-            pool_size=10,
+            pool_size=SYNC_POOL_SIZE,
             max_overflow=20,
             pool_pre_ping=True,
             echo=config.LOG_LEVEL.upper() == "DEBUG"
         )
         
-        # Asynchronous engine for application usage
+        # Asynchronous engine for application usage; a fixed-size LIFO pool
+        # keeps reusing the same warm connections instead of churning them
         self.async_engine = create_async_engine(
             config.async_database_url,
-            pool_size=10,
-            max_overflow=20,
+            pool_size=ASYNC_POOL_SIZE,
+            max_overflow=0,
+            pool_use_lifo=True,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            echo=config.LOG_LEVEL.upper() == "DEBUG"
+        )
+        
+        # Separate small pool for ingestion writes so a slow batch can't
+        # starve API reads of connections
+        self.write_engine = create_async_engine(
+            config.async_database_url,
+            pool_size=WRITE_POOL_SIZE,
+            max_overflow=0,
             pool_pre_ping=True,
+            pool_recycle=3600,
+            connect_args={'server_settings': {'synchronous_commit': 'off'}},
             echo=config.LOG_LEVEL.upper() == "DEBUG"
         )
         
-        # Session factories
-        self.SessionLocal = sessionmaker(
+        # Session factories (sync sessions are thread-scoped); objects keep
+        # their loaded state after commit instead of being re-SELECTed
+        self.SessionLocal = scoped_session(sessionmaker(
             autocommit=False,
             autoflush=False,
+            expire_on_commit=False,
             bind=self.sync_engine
+        ))
+        
+        self.AsyncSessionLocal = async_sessionmaker(
+            self.async_engine,
+            autoflush=False,
+            expire_on_commit=False
         )
         
-        self.AsyncSessionLocal = sessionmaker(
-            class_=AsyncSession,
-            autocommit=False,
+        self.WriteSessionLocal = async_sessionmaker(
+            self.write_engine,
             autoflush=False,
-            bind=self.async_engine
+            expire_on_commit=False
         )
+        
+        # Raw asyncpg pool for bulk ingestion, created on first use
+        self.pg_pool = None
+        self._pg_pool_lock = asyncio.Lock()
+        
+        # Cached symbol -> stock id map (see get_stock_ids)
+        self._stock_ids: Dict[str, int] = {}
+        self._stock_ids_loaded_at = 0.0
+        
+        # Long-lived autocommit connection reused by check_connection; the
+        # lock serialises its creation, use and reset across concurrent checks
+        self._health_conn = None
+        self._health_lock = asyncio.Lock()
     
     @contextmanager
     def get_session(self) -> Generator:
@@ -62,12 +301,12 @@ class DatabaseManager:
             logger.error(f"Database session error: {e}")
             raise
         finally:
-            session.close()
+            self.SessionLocal.remove()
     
     @asynccontextmanager
-    async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Get asynchronous database session"""
-        async with self.AsyncSessionLocal() as session:
+    async def _async_session_scope(self, session_factory) -> AsyncGenerator[AsyncSession, None]:
+        """Yield a session from session_factory, committing on success"""
+        async with session_factory() as session:
             try:
                 yield session
                 await session.commit()
@@ -76,16 +315,177 @@ class DatabaseManager:
                 logger.error(f"Async database session error: {e}")
                 raise
     
+    def get_async_session(self):
+        """Get asynchronous database session (read/API pool)"""
+        return self._async_session_scope(self.AsyncSessionLocal)
+    
+    get_read_session = get_async_session
+    
+    def get_write_session(self):
+        """Get asynchronous database session on the ingestion write pool"""
+        return self._async_session_scope(self.WriteSessionLocal)
+    
+    async def get_stock_ids(self) -> Dict[str, int]:
+        """Get the symbol -> stock id map, reloading it after STOCK_ID_CACHE_TTL seconds"""
+        if time.monotonic() - self._stock_ids_loaded_at > STOCK_ID_CACHE_TTL:
+            async with self.get_async_session() as session:
+                result = await session.execute(select(Stock.symbol, Stock.id))
+                self._stock_ids = {symbol: stock_id for symbol, stock_id in result.all()}
+            self._stock_ids_loaded_at = time.monotonic()
+        return self._stock_ids
+    
+    async def get_stock_id(self, symbol: str) -> Optional[int]:
+        """Get the stock id for a symbol from the cached map"""
+        return (await self.get_stock_ids()).get(symbol)
+    
+    def invalidate_stock_ids(self):
+        """Force the next stock id lookup to reload from the database"""
+        self._stock_ids_loaded_at = 0.0
+    
+    async def get_pg_pool(self) -> asyncpg.Pool:
+        """Get (creating on first use) the asyncpg pool used for bulk ingestion"""
+        if self.pg_pool is None:
+            async with self._pg_pool_lock:
+                if self.pg_pool is None:
+                    self.pg_pool = await asyncpg.create_pool(
+                        config.database_url,
+                        min_size=5,
+                        max_size=20,
+                        max_queries=50000,
+                        max_inactive_connection_lifetime=600.0,
+                        statement_cache_size=INGEST_STATEMENT_CACHE_SIZE,
+                        server_settings=INGEST_SERVER_SETTINGS,
+                        init=_init_pg_connection
+                    )
+                    logger.info("asyncpg ingestion pool created")
+        return self.pg_pool
+    
+    @asynccontextmanager
+    async def get_pg_conn(self) -> AsyncGenerator[asyncpg.Connection, None]:
+        """Get a raw asyncpg connection from the ingestion pool"""
+        pool = await self.get_pg_pool()
+        async with pool.acquire() as conn:
+            yield conn
+    
+    async def bulk_insert(self, table: str, rows: Sequence[tuple], columns: Sequence[str]) -> int:
+        """Insert rows (ordered as columns) into table in a single transaction"""
+        if not rows:
+            return 0
+        
+        async with self.get_pg_conn() as conn:
+            async with conn.transaction():
+                if len(rows) < COPY_THRESHOLD:
+                    placeholders = ', '.join(f'${i}' for i in range(1, len(columns) + 1))
+                    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+                    await conn.executemany(query, rows)
+                else:
+                    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+                        await conn.copy_records_to_table(
+                            table,
+                            records=rows[start:start + BULK_CHUNK_SIZE],
+                            columns=columns
+                        )
+        return len(rows)
+    
+    async def bulk_insert_stock_prices(self, records: Sequence[PriceRow]) -> int:
+        """Insert price rows into stock_prices"""
+        return await self.bulk_insert('stock_prices', records, STOCK_PRICE_COLUMNS)
+    
+    async def backfill_stock_prices(self, batches: Iterable[Sequence[PriceRow]]) -> int:
+        """Load a large historical backfill into stock_prices, one binary COPY per batch"""
+        total = 0
+        async with self.get_pg_conn() as conn:
+            # Remember the table's own setting so it can be put back afterwards
+            previous = await conn.fetchval("""
+                SELECT option_value
+                FROM pg_options_to_table((SELECT reloptions FROM pg_class WHERE oid = 'stock_prices'::regclass))
+                WHERE option_name = 'autovacuum_enabled'
+            """)
+            
+            # Autovacuum would otherwise chase the load; statistics are
+            # rebuilt with ANALYZE once it is done
+            await conn.execute("ALTER TABLE stock_prices SET (autovacuum_enabled = false)")
+            try:
+                async with conn.transaction():
+                    for batch in batches:
+                        status = await conn.copy_records_to_table(
+                            'stock_prices',
+                            records=batch,
+                            columns=STOCK_PRICE_COLUMNS
+                        )
+                        total += int(status.split()[-1])
+            finally:
+                if previous is None:
+                    await conn.execute("ALTER TABLE stock_prices RESET (autovacuum_enabled)")
+                else:
+                    await conn.execute(f"ALTER TABLE stock_prices SET (autovacuum_enabled = {previous})")
+            await conn.execute("ANALYZE stock_prices")
+        logger.info(f"Stock price backfill finished: {total} rows copied")
+        return total
+    
+    async def backfill_prices_from_parquet(self, path: str, batch_size: int = BULK_CHUNK_SIZE) -> int:
+        """Backfill stock_prices from a Parquet file with STOCK_PRICE_COLUMNS columns"""
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(path)
+        logger.info(f"Backfilling {parquet_file.metadata.num_rows} stock price rows from {path}")
+        
+        # Only one record batch is held in memory at a time
+        def record_batches():
+            for batch in parquet_file.iter_batches(batch_size=batch_size, columns=list(STOCK_PRICE_COLUMNS)):
+                columns = batch.to_pydict()
+                yield list(zip(*(columns[name] for name in STOCK_PRICE_COLUMNS)))
+        
+        return await self.backfill_stock_prices(record_batches())
+    
+    async def prewarm(self, *engines, connections: int = PREWARM_CONNECTIONS):
+        """Open a few connections on the given engines so the first requests skip connect latency"""
+        for engine in engines:
+            try:
+                # Only use free pool slots; with max_overflow=0 asking for more would block
+                count = max(0, min(connections, engine.pool.size() - engine.pool.checkedout()))
+                if isinstance(engine, AsyncEngine):
+                    conns = await asyncio.gather(*(engine.connect() for _ in range(count)))
+                    for conn in conns:
+                        await conn.close()
+                else:
+                    # Blocking driver, keep it off the event loop
+                    await asyncio.to_thread(self._prewarm_sync, engine, count)
+                logger.info(f"Database pool prewarmed ({count} connections)")
+            except Exception as e:
+                logger.warning(f"Database pool prewarm failed: {e}")
+    
+    @staticmethod
+    def _prewarm_sync(engine, count: int):
+        """Open and return count connections on a synchronous engine"""
+        conns = [engine.connect() for _ in range(count)]
+        for conn in conns:
+            conn.close()
+    
     async def check_connection(self) -> bool:
         """Check if database connection is working"""
-        try:
-            async with self.async_engine.begin() as conn:
-                await conn.execute(text("SELECT 1"))
-            logger.info("Database connection successful")
-            return True
-        except Exception as e:
-            logger.error(f"Database connection failed: {e}")
-            return False
+        async with self._health_lock:
+            try:
+                if self._health_conn is None or self._health_conn.closed:
+                    conn = await self.async_engine.connect()
+                    # Autocommit so the probe never leaves a transaction open
+                    self._health_conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await self._health_conn.exec_driver_sql("SELECT 1")
+                logger.info("Database connection successful")
+                return True
+            except Exception as e:
+                logger.error(f"Database connection failed: {e}")
+                await self._close_health_conn()
+                return False
+    
+    async def _close_health_conn(self):
+        """Drop the pinned health check connection (caller holds _health_lock)"""
+        if self._health_conn is not None:
+            try:
+                await self._health_conn.close()
+            except Exception:
+                pass
+            self._health_conn = None
     
     def create_tables(self):
         """Create all database tables"""
@@ -105,86 +505,194 @@ class DatabaseManager:
             logger.error(f"Failed to drop tables: {e}")
             raise
     
-    async def setup_extensions(self):
-        """Setup PostgreSQL extensions (TimescaleDB, pgvector)"""
-        extensions = [
+    async def setup_extensions(self, conn=None):
+        """Setup PostgreSQL extensions (TimescaleDB optional, pgvector required)"""
+        # Every TimescaleDB setup step is optional, so a missing extension is tolerated
+        await self._execute_optional(
+            "CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE",
             "CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE;",
-            "CREATE EXTENSION IF NOT EXISTS vector;"
-        ]
+            conn=conn
+        )
         
+        # news_articles.embedding is a vector column, so create_all can't run without pgvector
+        query = text("CREATE EXTENSION IF NOT EXISTS vector;")
         try:
-            async with self.async_engine.begin() as conn:
-                for extension in extensions:
-                    await conn.execute(text(extension))
-            logger.info("Database extensions setup successfully")
+            if conn is not None:
+                await conn.execute(query)
+            else:
+                async with self.async_engine.begin() as conn:
+                    await conn.execute(query)
         except Exception as e:
-            logger.error(f"Failed to setup extensions: {e}")
-            # Don't raise here as some extensions might not be available
-    
-    async def setup_hypertables(self):
-        """Setup TimescaleDB hypertables for time-series data"""
-        hypertable_queries = [
-            """
-            SELECT create_hypertable(
-                'stock_prices', 
-                'trade_date',
-                if_not_exists => TRUE
-            );
-            """,
-            """
-            SELECT create_hypertable(
-                'news_articles', 
-                'published_at',
-                if_not_exists => TRUE
-            );
-            """
-        ]
-        
+            raise RuntimeError(f"The pgvector extension is required but could not be created: {e}") from e
+        logger.info("Database extensions setup completed")
+    
+    async def _execute_optional(self, description: str, query: str, autocommit: bool = False, conn=None) -> bool:
+        """Run one optional setup statement, logging (not raising) on failure"""
         try:
-            async with self.async_engine.begin() as conn:
-                for query in hypertable_queries:
+            if conn is not None:
+                # Savepoint so a failed step doesn't abort the caller's transaction
+                async with conn.begin_nested():
                     await conn.execute(text(query))
-            logger.info("TimescaleDB hypertables setup successfully")
+            elif autocommit:
+                # Continuous aggregates cannot be created inside a transaction block
+                async with self.async_engine.connect() as conn:
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                    await conn.execute(text(query))
+            else:
+                async with self.async_engine.begin() as conn:
+                    await conn.execute(text(query))
+            return True
         except Exception as e:
-            logger.error(f"Failed to setup hypertables: {e}")
-            # Don't raise here as TimescaleDB might not be available
+            logger.warning(f"Skipped {description}: {e}")
+            return False
+    
+    async def setup_column_compression(self, conn=None):
+        """Use LZ4 TOAST compression for large news text columns (PostgreSQL 14+)"""
+        # Only affects newly written values; existing rows keep PGLZ until rewritten
+        for column in ('content', 'summary', 'ai_summary'):
+            await self._execute_optional(
+                f"lz4 compression for news_articles.{column}",
+                f"ALTER TABLE news_articles ALTER COLUMN {column} SET COMPRESSION lz4;",
+                conn=conn
+            )
+    
+    async def setup_updated_at_triggers(self, conn=None):
+        """Setup the triggers that fill updated_at on every UPDATE"""
+        await self._execute_optional("set_updated_at function", UPDATED_AT_FUNCTION, conn=conn)
+        for table in UPDATED_AT_TABLES:
+            # asyncpg runs one statement per execute, so drop and create separately
+            await self._execute_optional(
+                f"{table} updated_at trigger cleanup",
+                f"DROP TRIGGER IF EXISTS tr_{table}_updated_at ON {table};",
+                conn=conn
+            )
+            await self._execute_optional(
+                f"{table} updated_at trigger",
+                f"""
+                CREATE TRIGGER tr_{table}_updated_at BEFORE UPDATE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+                """,
+                conn=conn
+            )
+    
+    async def setup_table_storage(self, conn=None):
+        """Tune fillfactor and autovacuum on the daily upserted score tables"""
+        # fillfactor only applies to pages written after the change
+        for table in UPSERT_TABLES:
+            await self._execute_optional(
+                f"{table} storage parameters",
+                f"ALTER TABLE {table} SET ({UPSERT_TABLE_STORAGE});",
+                conn=conn
+            )
+    
+    async def setup_hypertables(self, conn=None):
+        """Setup TimescaleDB hypertables and compression"""
+        # Each step is optional so one failure doesn't roll back the rest
+        completed = 0
+        for description, query in HYPERTABLE_STEPS:
+            completed += await self._execute_optional(description, query, conn=conn)
+        logger.info(f"TimescaleDB hypertable setup completed ({completed}/{len(HYPERTABLE_STEPS)} steps applied)")
+    
+    async def setup_continuous_aggregates(self):
+        """Setup TimescaleDB continuous aggregates (outside any transaction)"""
+        completed = 0
+        for description, query in AGGREGATE_STEPS:
+            completed += await self._execute_optional(description, query, autocommit=True)
+        logger.info(f"TimescaleDB aggregate setup completed ({completed}/{len(AGGREGATE_STEPS)} steps applied)")
+    
+    async def teardown_timescale_compression(self):
+        """Drop the stock_prices compression setup and weekly rollup (outside any transaction)"""
+        # Best effort: these fail harmlessly when TimescaleDB isn't in use
+        completed = 0
+        for description, query in TIMESCALE_TEARDOWN_STEPS:
+            completed += await self._execute_optional(description, query, autocommit=True)
+        logger.info(f"TimescaleDB teardown completed ({completed}/{len(TIMESCALE_TEARDOWN_STEPS)} steps applied)")
+    
+    async def setup_rollup_views(self, conn=None):
+        """Setup the score rollup materialized views"""
+        completed = 0
+        for description, query in ROLLUP_VIEW_STEPS:
+            completed += await self._execute_optional(description, query, conn=conn)
+        logger.info(f"Rollup view setup completed ({completed}/{len(ROLLUP_VIEW_STEPS)} steps applied)")
+    
+    async def refresh_rollup_view(self, view_name: str) -> bool:
+        """Refresh a rollup materialized view without blocking readers"""
+        return await self._execute_optional(
+            f"{view_name} refresh",
+            f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name};"
+        )
     
     async def close(self):
         """Close database connections"""
+        async with self._health_lock:
+            await self._close_health_conn()
+        if self.pg_pool is not None:
+            await self.pg_pool.close()
+            self.pg_pool = None
         await self.async_engine.dispose()
+        await self.write_engine.dispose()
         self.sync_engine.dispose()
         logger.info("Database connections closed")
 
-# Global database manager instance
-db_manager = DatabaseManager()
+@lru_cache(maxsize=None)
+def get_db_manager() -> DatabaseManager:
+    """Get the process-wide database manager, creating its engines on first use"""
+    return DatabaseManager()
+
+def __getattr__(name):
+    # Keep `from ..database.database import db_manager` working without
+    # building the engines at import time
+    if name == 'db_manager':
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Convenience functions for dependency injection
 def get_db_session():
-    """Dependency function for FastAPI to get database session"""
-    with db_manager.get_session() as session:
-        yield session
-
-async def get_async_db_session():
-    """Dependency function for FastAPI to get async database session"""
-    async with db_manager.get_async_session() as session:
+    """Dependency function for FastAPI to get database session (thread-scoped)"""
+    with get_db_manager().get_session() as session:
         yield session
 
 async def init_database():
     """Initialize database with tables and extensions"""
     logger.info("Initializing database...")
+    db_manager = get_db_manager()
     
     # Check connection
     if not await db_manager.check_connection():
         raise Exception("Cannot connect to database")
     
-    # Setup extensions
-    await db_manager.setup_extensions()
+    # Extensions, tables, hypertables and storage settings go in one
+    # transaction; the advisory lock keeps concurrent startups from racing
+    async with db_manager.async_engine.begin() as conn:
+        await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': INIT_LOCK_KEY})
+        
+        # Setup extensions
+        await db_manager.setup_extensions(conn)
+        
+        # Create tables
+        await conn.run_sync(Base.metadata.create_all)
+        logger.info("Database tables created successfully")
+        
+        # Setup updated_at triggers
+        await db_manager.setup_updated_at_triggers(conn)
+        
+        # Setup hypertables
+        await db_manager.setup_hypertables(conn)
+        
+        # Setup TOAST compression for news text
+        await db_manager.setup_column_compression(conn)
+        
+        # Setup storage parameters for upserted score tables
+        await db_manager.setup_table_storage(conn)
+        
+        # Setup score rollups
+        await db_manager.setup_rollup_views(conn)
     
-    # Create tables
-    db_manager.create_tables()
+    # Continuous aggregates can only be created once the hypertable is committed
+    await db_manager.setup_continuous_aggregates()
     
-    # Setup hypertables
-    await db_manager.setup_hypertables()
+    # Warm the pools the pipeline uses (reads and ingestion writes)
+    await db_manager.prewarm(db_manager.async_engine, db_manager.write_engine)
     
     logger.info("Database initialization completed")
 
@@ -200,18 +708,21 @@ if __name__ == "__main__":
             if command == "init":
                 await init_database()
             elif command == "create-tables":
-                db_manager.create_tables()
+                get_db_manager().create_tables()
             elif command == "drop-tables":
-                db_manager.drop_tables()
+                get_db_manager().drop_tables()
             elif command == "check":
-                success = await db_manager.check_connection()
+                success = await get_db_manager().check_connection()
                 sys.exit(0 if success else 1)
+            elif command == "backfill-prices" and len(sys.argv) > 2:
+                await get_db_manager().backfill_prices_from_parquet(sys.argv[2])
+                await get_db_manager().close()
             else:
-                print("Available commands: init, create-tables, drop-tables, check")
+                print("Available commands: init, create-tables, drop-tables, check, backfill-prices <file.parquet>")
                 sys.exit(1)
         else:
             print("Usage: python -m src.database.database <command>")
-            print("Commands: init, create-tables, drop-tables, check")
+            print("Commands: init, create-tables, drop-tables, check, backfill-prices <file.parquet>")
             sys.exit(1)
     
     asyncio.run(main())
\ No newline at end of file
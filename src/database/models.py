@@ -2,17 +2,41 @@
 Database models for AlphaGen Investment Platform
 """
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Numeric, Text, Boolean, 
-    ForeignKey, Index, UniqueConstraint
+    Column, Integer, BigInteger, SmallInteger, String, DateTime, Numeric, Float, REAL, Text, Boolean, 
+    ForeignKey, Index, UniqueConstraint, FetchedValue, text
 )
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, ENUM
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
+from pgvector.sqlalchemy import Vector
 from datetime import datetime
+import hashlib
 import uuid
 
+from ..config.settings import config
+
 Base = declarative_base()
 
+# Dimension of the news article text embeddings
+EMBEDDING_DIM = config.EMBEDDING_DIM
+
+def url_hash(url: str) -> int:
+    """Signed 64-bit BLAKE2b hash of a URL, used as the news dedup key"""
+    return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), 'big', signed=True)
+
+# Postgres enum types for the fixed label columns
+SENTIMENT_LABEL = ENUM('positive', 'negative', 'neutral', name='sentiment_label_t')
+MA_SIGNAL = ENUM('bullish', 'bearish', 'neutral', name='ma_signal_t')
+VOLUME_TREND = ENUM('increasing', 'decreasing', 'stable', name='volume_trend_t')
+RECOMMENDATION = ENUM('BUY', 'HOLD', 'SELL', name='recommendation_t')
+CONFIDENCE_LEVEL = ENUM('HIGH', 'MEDIUM', 'LOW', name='confidence_level_t')
+
+# Relationships use lazy="raise": callers opt into loading with
+# selectinload()/joinedload() instead of triggering N+1 lazy loads, which
+# would also fail under AsyncSession. Large NewsArticle columns are
+# deferred the same way; load them with undefer() or undefer_group("full_text")
+
 class Stock(Base):
     """Stock master data table"""
     __tablename__ = "stocks"
@@ -25,12 +49,12 @@ class Stock(Base):
     is_lq45 = Column(Boolean, default=False, index=True)
     market_cap = Column(Numeric(20, 2))
     currency = Column(String(3), default='IDR')
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relationships
-    stock_prices = relationship("StockPrice", back_populates="stock")
-    financial_statements = relationship("FinancialStatement", back_populates="stock")
+    stock_prices = relationship("StockPrice", back_populates="stock", lazy="raise")
+    financial_statements = relationship("FinancialStatement", back_populates="stock", lazy="raise")
     
     def __repr__(self):
         return f"<Stock(symbol='{self.symbol}', company_name='{self.company_name}')>"
@@ -39,24 +63,35 @@ class StockPrice(Base):
     """Daily stock price data (OHLCV) - TimescaleDB hypertable"""
     __tablename__ = "stock_prices"
     
+    # trade_date is part of the primary key so the table can be a hypertable
     id = Column(Integer, primary_key=True, autoincrement=True)
     stock_id = Column(Integer, ForeignKey("stocks.id"), nullable=False)
-    trade_date = Column(DateTime, nullable=False)
-    open_price = Column(Numeric(15, 2), nullable=False)
-    high_price = Column(Numeric(15, 2), nullable=False)
-    low_price = Column(Numeric(15, 2), nullable=False)
-    close_price = Column(Numeric(15, 2), nullable=False)
-    volume = Column(Integer, nullable=False)
-    adjusted_close = Column(Numeric(15, 2))
-    created_at = Column(DateTime, default=func.now())
+    trade_date = Column(DateTime, primary_key=True, nullable=False)
+    # OHLC prices are DOUBLE PRECISION for fast aggregation
+    open_price = Column(Float, nullable=False)
+    high_price = Column(Float, nullable=False)
+    low_price = Column(Float, nullable=False)
+    close_price = Column(Float, nullable=False)
+    volume = Column(BigInteger, nullable=False)
+    adjusted_close = Column(Float)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    stock = relationship("Stock", back_populates="stock_prices")
+    stock = relationship("Stock", back_populates="stock_prices", lazy="raise")
     
     # Indexes
     __table_args__ = (
-        Index("idx_stock_prices_stock_date", "stock_id", "trade_date"),
-        Index("idx_stock_prices_date", "trade_date"),
+        # Covering index: per-symbol close history is an index-only scan
+        Index(
+            "idx_stock_prices_stock_date", "stock_id", text("trade_date DESC"),
+            postgresql_include=["close_price", "adjusted_close"],
+        ),
+        # BRIN suits the time-ordered inserts and cross-stock date range scans
+        Index(
+            "idx_stock_prices_date_brin", "trade_date",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
         UniqueConstraint("stock_id", "trade_date", name="uq_stock_price_date"),
     )
     
@@ -72,7 +107,7 @@ class FinancialStatement(Base):
     statement_type = Column(String(20), nullable=False)  # 'quarterly', 'annual'
     period_end = Column(DateTime, nullable=False)
     fiscal_year = Column(Integer, nullable=False)
-    fiscal_quarter = Column(Integer)  # 1,2,3,4 for quarterly
+    fiscal_quarter = Column(SmallInteger)  # 1,2,3,4 for quarterly
     
     # Income Statement
     revenue = Column(Numeric(20, 2))
@@ -99,11 +134,11 @@ class FinancialStatement(Base):
     roe = Column(Numeric(10, 4))  # Return on equity
     roa = Column(Numeric(10, 4))  # Return on assets
     
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relationships
-    stock = relationship("Stock", back_populates="financial_statements")
+    stock = relationship("Stock", back_populates="financial_statements", lazy="raise")
     
     # Indexes
     __table_args__ = (
@@ -121,43 +156,59 @@ class NewsArticle(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(Text, nullable=False)
-    content = Column(Text)
+    content = deferred(Column(Text), group="full_text", raiseload=True)
     summary = Column(Text)
-    url = Column(Text, unique=True, nullable=False)
+    url = Column(Text, nullable=False)
+    url_hash = Column(BigInteger, nullable=False)  # url_hash(url); unique dedup key
     source = Column(String(100), nullable=False)
     author = Column(String(255))
-    published_at = Column(DateTime, nullable=False, index=True)
+    published_at = Column(DateTime, nullable=False)
     
     # Categorization
     category = Column(String(50))  # 'market', 'company', 'economic', 'political'
-    relevance_score = Column(Numeric(3, 2))  # 0.0 to 1.0
+    relevance_score = Column(REAL)  # 0.0 to 1.0
     
     # Sentiment analysis (enhanced for qualitative engine)
-    sentiment_score = Column(Numeric(3, 2))  # -1.0 to 1.0
-    sentiment_label = Column(String(20))  # 'positive', 'negative', 'neutral'
-    confidence = Column(Numeric(3, 2))  # 0.0 to 1.0 from AI analysis
-    themes = Column(Text)  # JSON array of extracted themes
-    ai_summary = Column(Text)  # AI-generated summary
+    sentiment_score = Column(REAL)  # -1.0 to 1.0
+    sentiment_label = Column(SENTIMENT_LABEL)  # 'positive', 'negative', 'neutral'
+    confidence = Column(REAL)  # 0.0 to 1.0 from AI analysis
+    themes = Column(ARRAY(Text))  # Extracted themes
+    ai_summary = deferred(Column(Text), group="full_text", raiseload=True)  # AI-generated summary
     processed_at = Column(DateTime)  # When sentiment analysis was completed
     
     # Text embeddings for similarity search (pgvector)
-    embedding = Column(Text)  # JSON serialized vector
+    embedding = deferred(Column(Vector(EMBEDDING_DIM)), raiseload=True)
     
     # Processing status
     is_processed = Column(Boolean, default=False)
     language = Column(String(5), default='id')  # 'id' for Indonesian, 'en' for English
     
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relationships
-    stock_mentions = relationship("NewsStockMention", back_populates="news_article")
+    stock_mentions = relationship("NewsStockMention", back_populates="news_article", lazy="raise")
     
     # Indexes
     __table_args__ = (
-        Index("idx_news_articles_published", "published_at"),
+        Index(
+            "idx_news_articles_published_brin", "published_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
         Index("idx_news_articles_source", "source"),
-        Index("idx_news_articles_processed", "is_processed"),
+        Index("idx_news_themes_gin", "themes", postgresql_using="gin"),
+        Index(
+            "idx_news_unprocessed", "published_at",
+            postgresql_where=text("is_processed = false"),
+        ),
+        UniqueConstraint("url_hash", name="uq_news_url_hash"),
+        Index(
+            "idx_news_articles_embedding", "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
     )
     
     def __repr__(self):
@@ -170,12 +221,12 @@ class NewsStockMention(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     news_article_id = Column(Integer, ForeignKey("news_articles.id"), nullable=False)
     stock_id = Column(Integer, ForeignKey("stocks.id"), nullable=False)
-    mention_count = Column(Integer, default=1)
-    sentiment_impact = Column(Numeric(3, 2))  # Impact score for this specific stock
+    mention_count = Column(SmallInteger, default=1)
+    sentiment_impact = Column(REAL)  # Impact score for this specific stock
     
     # Relationships
-    news_article = relationship("NewsArticle", back_populates="stock_mentions")
-    stock = relationship("Stock")
+    news_article = relationship("NewsArticle", back_populates="stock_mentions", lazy="raise")
+    stock = relationship("Stock", lazy="raise")
     
     # Indexes
     __table_args__ = (
@@ -185,23 +236,28 @@ class NewsStockMention(Base):
     )
 
 class DataIngestionLog(Base):
-    """Log table for tracking data ingestion operations"""
+    """Log table for tracking data ingestion operations - TimescaleDB hypertable"""
     __tablename__ = "data_ingestion_logs"
     
+    # start_time is part of the primary key so the table can be a hypertable
     id = Column(Integer, primary_key=True, autoincrement=True)
     process_type = Column(String(50), nullable=False)  # 'market_data', 'news_data'
     status = Column(String(20), nullable=False)  # 'started', 'completed', 'failed'
-    start_time = Column(DateTime, nullable=False)
+    start_time = Column(DateTime, primary_key=True, nullable=False)
     end_time = Column(DateTime)
     records_processed = Column(Integer, default=0)
     error_message = Column(Text)
-    process_metadata = Column(Text)  # JSON for additional info
+    process_metadata = Column(JSONB)  # Additional info (named to avoid Base.metadata)
     
     # Indexes
     __table_args__ = (
         Index("idx_data_ingestion_logs_type", "process_type"),
         Index("idx_data_ingestion_logs_status", "status"),
-        Index("idx_data_ingestion_logs_time", "start_time"),
+        Index(
+            "idx_data_ingestion_logs_time_brin", "start_time",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
     )
     
     def __repr__(self):
@@ -216,36 +272,39 @@ class QuantitativeScores(Base):
     analysis_date = Column(DateTime, nullable=False)
     
     # Valuation metrics
-    pe_ratio = Column(Numeric(10, 2))
-    pb_ratio = Column(Numeric(10, 2))
-    pe_relative_score = Column(Numeric(5, 2))  # 0-100 score vs historical/industry
-    pb_relative_score = Column(Numeric(5, 2))  # 0-100 score vs historical/industry
+    pe_ratio = Column(Float)
+    pb_ratio = Column(Float)
+    pe_relative_score = Column(Float)  # 0-100 score vs historical/industry
+    pb_relative_score = Column(Float)  # 0-100 score vs historical/industry
     
     # Technical indicators
-    rsi = Column(Numeric(5, 2))  # 0-100
-    rsi_score = Column(Numeric(5, 2))  # 0-100 score based on RSI
-    ma_50 = Column(Numeric(15, 2))  # 50-day moving average
-    ma_200 = Column(Numeric(15, 2))  # 200-day moving average
-    ma_signal = Column(String(10))  # 'bullish', 'bearish', 'neutral'
-    ma_score = Column(Numeric(5, 2))  # 0-100 score based on MA position
+    rsi = Column(Float)  # 0-100
+    rsi_score = Column(Float)  # 0-100 score based on RSI
+    ma_50 = Column(Float)  # 50-day moving average
+    ma_200 = Column(Float)  # 200-day moving average
+    ma_signal = Column(MA_SIGNAL)  # 'bullish', 'bearish', 'neutral'
+    ma_score = Column(Float)  # 0-100 score based on MA position
     
     # Volume analysis
-    volume_trend = Column(String(10))  # 'increasing', 'decreasing', 'stable'
-    volume_score = Column(Numeric(5, 2))  # 0-100 score based on volume
+    volume_trend = Column(VOLUME_TREND)  # 'increasing', 'decreasing', 'stable'
+    volume_score = Column(Float)  # 0-100 score based on volume
     
     # Composite scores
-    valuation_score = Column(Numeric(5, 2))  # 0-100 composite valuation
-    technical_score = Column(Numeric(5, 2))  # 0-100 composite technical
-    composite_score = Column(Numeric(5, 2))  # 0-100 overall quantitative score
+    valuation_score = Column(Float)  # 0-100 composite valuation
+    technical_score = Column(Float)  # 0-100 composite technical
+    composite_score = Column(Float)  # 0-100 overall quantitative score
     
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    stock = relationship("Stock")
+    stock = relationship("Stock", lazy="raise")
     
     # Indexes
     __table_args__ = (
-        Index("idx_quantitative_scores_stock_date", "stock_id", "analysis_date"),
+        Index(
+            "idx_quantitative_scores_stock_date", "stock_id", text("analysis_date DESC"),
+            postgresql_include=["composite_score"],
+        ),
         Index("idx_quantitative_scores_date", "analysis_date"),
         Index("idx_quantitative_scores_composite", "composite_score"),
         UniqueConstraint("stock_id", "analysis_date", name="uq_quantitative_score_date"),
@@ -262,19 +321,19 @@ class SentimentAnalysis(Base):
     news_article_id = Column(Integer, ForeignKey("news_articles.id"), nullable=False)
     
     # Gemini analysis results
-    sentiment_score = Column(Numeric(3, 2), nullable=False)  # -1.0 to 1.0
-    confidence = Column(Numeric(3, 2), nullable=False)  # 0.0 to 1.0
-    themes = Column(Text)  # JSON array of themes
+    sentiment_score = Column(REAL, nullable=False)  # -1.0 to 1.0
+    confidence = Column(REAL, nullable=False)  # 0.0 to 1.0
+    themes = Column(ARRAY(Text))  # Themes from the analysis
     summary = Column(Text)  # Brief summary from AI
-    relevance = Column(Numeric(3, 2))  # 0.0 to 1.0 relevance to stock price
+    relevance = Column(REAL)  # 0.0 to 1.0 relevance to stock price
     
     # Processing metadata
     model_used = Column(String(50), default="gemini-2.5-pro")
     processing_time_ms = Column(Integer)
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    news_article = relationship("NewsArticle")
+    news_article = relationship("NewsArticle", lazy="raise")
     
     # Indexes
     __table_args__ = (
@@ -300,26 +359,41 @@ class DailyRecommendations(Base):
     combined_score = Column(Numeric(5, 2))  # 0-100 final weighted score
     
     # Recommendation details
-    recommendation = Column(String(10))  # 'BUY', 'HOLD', 'SELL'
-    confidence_level = Column(String(10))  # 'HIGH', 'MEDIUM', 'LOW'
+    recommendation = Column(RECOMMENDATION)  # 'BUY', 'HOLD', 'SELL'
+    confidence_level = Column(CONFIDENCE_LEVEL)  # 'HIGH', 'MEDIUM', 'LOW'
     price_target = Column(Numeric(15, 2))  # Estimated target price
     
     # Supporting data
-    key_themes = Column(Text)  # JSON array of key themes from news
-    technical_signals = Column(Text)  # JSON object of technical signals
-    risk_factors = Column(Text)  # JSON array of identified risks
+    key_themes = Column(ARRAY(Text))  # Key themes from news
+    technical_signals = Column(JSONB)  # Technical signals
+    risk_factors = Column(ARRAY(Text))  # Identified risks
     
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    stock = relationship("Stock")
+    stock = relationship("Stock", lazy="raise")
     
     # Indexes
     __table_args__ = (
-        Index("idx_daily_recommendations_stock_date", "stock_id", "recommendation_date"),
+        Index(
+            "idx_daily_recommendations_stock_date", "stock_id", text("recommendation_date DESC"),
+            postgresql_include=["combined_score", "recommendation"],
+        ),
         Index("idx_daily_recommendations_date", "recommendation_date"),
-        Index("idx_daily_recommendations_score", "combined_score"),
-        Index("idx_daily_recommendations_rec", "recommendation"),
+        Index(
+            "idx_daily_rec_top", "recommendation_date", text("combined_score DESC"),
+            postgresql_include=["stock_id", "recommendation", "confidence_level"],
+        ),
+        Index(
+            "idx_daily_rec_buy", "recommendation_date",
+            postgresql_where=text("recommendation = 'BUY'"),
+            postgresql_include=["stock_id", "combined_score"],
+        ),
+        Index(
+            "idx_daily_rec_sell", "recommendation_date",
+            postgresql_where=text("recommendation = 'SELL'"),
+            postgresql_include=["stock_id", "combined_score"],
+        ),
         UniqueConstraint("stock_id", "recommendation_date", name="uq_daily_recommendation_date"),
     )
     
@@ -334,10 +408,11 @@ class Portfolio(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(100), unique=True, nullable=False, index=True)
     description = Column(Text)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relationships
+    # Left lazy so delete cascades can still load the trades
     trades = relationship("Trade", back_populates="portfolio", cascade="all, delete-orphan")
     
     def __repr__(self):
@@ -363,11 +438,11 @@ class Trade(Base):
     fees = Column(Numeric(10, 2), default=0)  # Transaction fees
     notes = Column(Text)
     
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    portfolio = relationship("Portfolio", back_populates="trades")
-    stock = relationship("Stock")
+    portfolio = relationship("Portfolio", back_populates="trades", lazy="raise")
+    stock = relationship("Stock", lazy="raise")
     
     # Indexes
     __table_args__ = (
@@ -1,8 +1,11 @@
 """
 Logging configuration for AlphaGen Investment Platform
 """
+import atexit
 import logging
+from functools import lru_cache
 import logging.handlers
+import queue
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
@@ -10,6 +13,27 @@ import sys
 
 from ..config.settings import config
 
+# Records never use thread/process names, so skip collecting them
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Shared formatters, built once at import. Source locations are only
+# written to the low-volume error log
+_FILE_FMT = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_DETAILED_FMT = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+)
+_SIMPLE_FMT = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_MARKET_FMT = logging.Formatter('%(asctime)s - MARKET - %(levelname)s - %(message)s')
+_NEWS_FMT = logging.Formatter('%(asctime)s - NEWS - %(levelname)s - %(message)s')
+
+# Background listeners draining queued records to the real handlers, by logger name
+_queue_listeners = {}
+
+# Logger names whose handlers have already been attached
+_initialized_loggers = set()
+
 class Logger:
     """Custom logger class for the application"""
     
@@ -23,21 +47,14 @@ class Logger:
         self.logger.setLevel(getattr(logging, config.LOG_LEVEL.upper()))
         
         # Prevent duplicate handlers
-        if self.logger.handlers:
+        if self.name in _initialized_loggers:
             return
-        
-        # Create formatters
-        detailed_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
-        )
-        simple_formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s'
-        )
+        _initialized_loggers.add(self.name)
         
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(simple_formatter)
+        console_handler.setFormatter(_SIMPLE_FMT)
         self.logger.addHandler(console_handler)
         
         # File handler for all logs
@@ -45,10 +62,11 @@ class Logger:
         file_handler = logging.handlers.RotatingFileHandler(
             log_file,
             maxBytes=10*1024*1024,  # 10MB
-            backupCount=5
+            backupCount=5,
+            delay=True
         )
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(detailed_formatter)
+        file_handler.setFormatter(_FILE_FMT)
         self.logger.addHandler(file_handler)
         
         # Error file handler
@@ -56,22 +74,50 @@ class Logger:
         error_handler = logging.handlers.RotatingFileHandler(
             error_file,
             maxBytes=5*1024*1024,  # 5MB
-            backupCount=3
+            backupCount=3,
+            delay=True
         )
         error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(detailed_formatter)
+        error_handler.setFormatter(_DETAILED_FMT)
         self.logger.addHandler(error_handler)
     
     def get_logger(self) -> logging.Logger:
         """Get the configured logger instance"""
         return self.logger
 
+class ChannelFilter(logging.Filter):
+    """Pass only records tagged with the given channel"""
+    
+    def __init__(self, channel: str):
+        super().__init__()
+        self.channel = channel
+    
+    def filter(self, record):
+        return getattr(record, 'channel', None) == self.channel
+
 class DataPipelineLogger(Logger):
     """Specialized logger for data pipeline operations"""
     
     def __init__(self):
         super().__init__("data_pipeline")
-        self._setup_pipeline_handlers()
+        if self.name not in _queue_listeners:
+            self._setup_pipeline_handlers()
+            self._setup_queue_listener()
+    
+    def _setup_queue_listener(self):
+        """Move handlers behind a queue so callers never block on log I/O"""
+        handlers = list(self.logger.handlers)
+        for handler in handlers:
+            self.logger.removeHandler(handler)
+        
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        
+        listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        listener.start()
+        _queue_listeners[self.name] = listener
     
     def _setup_pipeline_handlers(self):
         """Setup additional handlers for data pipeline"""
@@ -80,50 +126,70 @@ class DataPipelineLogger(Logger):
         market_handler = logging.handlers.RotatingFileHandler(
             market_file,
             maxBytes=10*1024*1024,
-            backupCount=10
+            backupCount=10,
+            delay=True
         )
         market_handler.setLevel(logging.INFO)
-        market_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - MARKET - %(levelname)s - %(message)s'
-        ))
+        market_handler.setFormatter(_MARKET_FMT)
         
         # News data handler
         news_file = config.LOGS_DIR / "news_data.log"
         news_handler = logging.handlers.RotatingFileHandler(
             news_file,
             maxBytes=10*1024*1024,
-            backupCount=10
+            backupCount=10,
+            delay=True
         )
         news_handler.setLevel(logging.INFO)
-        news_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - NEWS - %(levelname)s - %(message)s'
-        ))
+        news_handler.setFormatter(_NEWS_FMT)
         
-        # Add filters to route messages to appropriate handlers
-        class MarketFilter(logging.Filter):
-            def filter(self, record):
-                return 'market' in record.getMessage().lower()
-        
-        class NewsFilter(logging.Filter):
-            def filter(self, record):
-                return 'news' in record.getMessage().lower()
-        
-        market_handler.addFilter(MarketFilter())
-        news_handler.addFilter(NewsFilter())
+        # Route records by the channel set through the channel logger adapters
+        market_handler.addFilter(ChannelFilter('market'))
+        news_handler.addFilter(ChannelFilter('news'))
         
         self.logger.addHandler(market_handler)
         self.logger.addHandler(news_handler)
 
+def stop_log_listeners():
+    """Flush queued log records and stop the background listeners"""
+    while _queue_listeners:
+        _, listener = _queue_listeners.popitem()
+        listener.stop()
+
+atexit.register(stop_log_listeners)
+
+@lru_cache(maxsize=None)
 def get_logger(name: str = "alphagen") -> logging.Logger:
     """Get a logger instance"""
     logger_instance = Logger(name)
     return logger_instance.get_logger()
 
+@lru_cache(maxsize=None)
 def get_pipeline_logger() -> logging.Logger:
     """Get a specialized logger for data pipeline operations"""
     logger_instance = DataPipelineLogger()
     return logger_instance.get_logger()
 
-# Create default logger instances
-default_logger = get_logger()
-pipeline_logger = get_pipeline_logger()
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_channel_logger(channel: str) -> logging.LoggerAdapter:
+    """Get a pipeline logger whose records are tagged with a channel"""
+    return logging.LoggerAdapter(get_pipeline_logger(), {'channel': channel})
+
+def get_market_logger() -> logging.LoggerAdapter:
+    """Get the pipeline logger for market data, also written to market_data.log"""
+    return get_channel_logger('market')
+
+def get_news_logger() -> logging.LoggerAdapter:
+    """Get the pipeline logger for news data, also written to news_data.log"""
+    return get_channel_logger('news')
+
+# Default logger instances, created on first access rather than at import
+_DEFAULT_LOGGERS = {
+    'default_logger': get_logger,
+    'pipeline_logger': get_pipeline_logger,
+}
+
+def __getattr__(name):
+    if name in _DEFAULT_LOGGERS:
+        return _DEFAULT_LOGGERS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -28,7 +28,8 @@ async def main():
     print("🧪 Testing AlphaGen Phase 3 API Endpoints")
     print("=" * 50)
     
-    async with aiohttp.ClientSession() as session:
+    connector = aiohttp.TCPConnector(limit=20)
+    async with aiohttp.ClientSession(connector=connector) as session:
         # Test basic endpoints
         tests = [
             ("GET", "/", "Root endpoint"),
@@ -48,9 +49,15 @@ async def main():
             ("GET", "/api/v1/portfolio/test_portfolio", "Portfolio view"),
         ]
         
+        # Read-only probes run concurrently; results print in declaration order
+        results = await asyncio.gather(
+            *(test_endpoint(session, method, endpoint) for method, endpoint, _ in tests + phase3_tests)
+        )
+        basic_results = results[:len(tests)]
+        phase3_results = results[len(tests):]
+        
         print("🔍 Testing Basic Endpoints:")
-        for method, endpoint, description in tests:
-            status, response = await test_endpoint(session, method, endpoint)
+        for (method, endpoint, description), (status, response) in zip(tests, basic_results):
             status_color = "🟢" if status and 200 <= status < 300 else "🔴"
             print(f"  {status_color} {method} {endpoint} - {description}")
             if status:
@@ -59,8 +66,7 @@ async def main():
                 print(f"     Error: {response}")
         
         print("\n🚀 Testing Phase 3 Endpoints:")
-        for method, endpoint, description in phase3_tests:
-            status, response = await test_endpoint(session, method, endpoint)
+        for (method, endpoint, description), (status, response) in zip(phase3_tests, phase3_results):
             status_color = "🟢" if status and 200 <= status < 300 else "🔴"
             print(f"  {status_color} {method} {endpoint} - {description}")
             if status:
@@ -70,7 +76,7 @@ async def main():
             else:
                 print(f"     Error: {response}")
         
-        # Test portfolio creation
+        # Test portfolio creation (kept sequential, it mutates state)
         print("\n📊 Testing Portfolio Management:")
         trade_data = {
             "action": "BUY",
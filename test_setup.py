@@ -1,102 +1,112 @@
 #!/usr/bin/env python3
 """
 Simple validation test for AlphaGen setup
+
+Run with: pytest test_setup.py (or ./test_setup.py)
+or in parallel with pytest-xdist: pytest -n auto test_setup.py
 """
 import sys
+import importlib
 import importlib.util
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from itertools import filterfalse
+from operator import methodcaller
 
-# Add project root to path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+import pytest
 
-def test_imports():
-    """Test that all required modules can be imported"""
-    modules_to_test = [
-        'src.config.settings',
-        'src.data_pipeline.lq45_stocks',
-        'src.database.models',
-        'src.utils.logger',
-    ]
-    
-    print("Testing module imports...")
-    
-    for module_name in modules_to_test:
-        try:
-            module = importlib.import_module(module_name)
-            print(f"✅ {module_name}")
-        except ImportError as e:
-            print(f"❌ {module_name}: {e}")
-            return False
-    
-    return True
+# ASCII status markers, safe on non-UTF-8 consoles
+_OK, _FAIL = '[OK]', '[FAIL]'
 
-def test_lq45_stocks():
-    """Test LQ45 stocks configuration"""
-    try:
-        from src.data_pipeline.lq45_stocks import get_lq45_symbols, LQ45_STOCKS
-        
-        symbols = get_lq45_symbols()
-        print(f"\n✅ LQ45 stocks loaded: {len(symbols)} symbols")
-        print(f"Sample stocks: {symbols[:5]}")
-        
-        # Verify all symbols end with .JK
-        invalid_symbols = [s for s in symbols if not s.endswith('.JK')]
-        if invalid_symbols:
-            print(f"❌ Invalid symbols found: {invalid_symbols}")
-            return False
-        
+# Third-party packages the platform imports; these are only checked for
+# presence, without executing them
+DEPENDENCIES = (
+    'dotenv',
+    'sqlalchemy',
+    'asyncpg',
+    'pgvector',
+    'fastapi',
+    'pandas',
+    'pyarrow',
+    'yfinance',
+)
+
+# Project modules are really imported so broken dependencies surface.
+# The heavy ones are skipped when a cheap one fails to import
+CHEAP_MODULES = (
+    'src.utils.logger',
+    'src.config.settings',
+)
+HEAVY_MODULES = (
+    'src.api.main',
+    'src.database.models',
+    'src.data_pipeline.lq45_stocks',
+)
+MODULES = CHEAP_MODULES + HEAVY_MODULES
+
+def _find_package(name):
+    """Check a package resolves without executing its top-level code"""
+    if name in sys.modules:
         return True
-        
-    except Exception as e:
-        print(f"❌ LQ45 stocks test failed: {e}")
-        return False
+    return importlib.util.find_spec(name) is not None
 
-def test_config():
-    """Test configuration"""
+def _ensure_imported(name):
+    """Return an already-loaded module, importing it only on first use"""
+    module = sys.modules.get(name)
+    return module if module is not None else importlib.import_module(name)
+
+def _cheap_modules_import():
+    """Check the cheap modules import; they are cached after the first success"""
     try:
-        from src.config.settings import config
-        
-        print(f"\n✅ Configuration loaded")
-        print(f"Database URL: {config.database_url}")
-        print(f"Environment: {config.ENVIRONMENT}")
-        print(f"Log level: {config.LOG_LEVEL}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Configuration test failed: {e}")
+        for name in CHEAP_MODULES:
+            _ensure_imported(name)
+    except Exception:
         return False
+    return True
 
-def main():
-    """Run all tests"""
-    print("🚀 AlphaGen Setup Validation Test\n")
-    
-    tests = [
-        ("Module Imports", test_imports),
-        ("LQ45 Stocks", test_lq45_stocks),
-        ("Configuration", test_config),
-    ]
-    
-    passed = 0
-    total = len(tests)
+@pytest.fixture(scope='module')
+def dependency_lookups():
+    """Resolve all dependencies on a thread pool so file system lookups overlap"""
+    with ThreadPoolExecutor(max_workers=min(8, len(DEPENDENCIES))) as executor:
+        return dict(zip(DEPENDENCIES, executor.map(_find_package, DEPENDENCIES)))
+
+@pytest.mark.parametrize('name', DEPENDENCIES)
+def test_dependency_installed(name, dependency_lookups):
+    """Test that a required third-party package is installed"""
+    assert dependency_lookups[name], f"{_FAIL} Package {name} is not installed"
+
+@pytest.mark.parametrize('name', MODULES)
+def test_import(name):
+    """Test that a project module imports cleanly"""
+    # Checked here rather than via earlier results so it holds under xdist
+    if name in HEAVY_MODULES and not _cheap_modules_import():
+        pytest.skip("Skipped because a cheaper module failed to import")
+    _ensure_imported(name)
+
+def test_lq45_stocks(lq45_symbols):
+    """Test LQ45 stocks configuration"""
+    print(
+        f"{_OK} LQ45 stocks loaded: {len(lq45_symbols)} symbols\n"
+        f"Sample stocks: {lq45_symbols[:5]}"
+    )
     
-    for test_name, test_func in tests:
-        print(f"\n--- {test_name} ---")
-        if test_func():
-            passed += 1
-        else:
-            print(f"❌ {test_name} failed")
+    assert lq45_symbols, "No LQ45 symbols configured"
     
-    print(f"\n{'='*50}")
-    print(f"Test Results: {passed}/{total} passed")
+    # Verify all symbols end with .JK
+    invalid_symbol = next(filterfalse(methodcaller('endswith', '.JK'), lq45_symbols), None)
+    assert invalid_symbol is None, f"{_FAIL} Invalid symbol found: {invalid_symbol}"
+
+def test_config(config):
+    """Test configuration"""
+    # database_url is a property that rebuilds the URL on each access
+    database_url, environment, log_level = config.database_url, config.ENVIRONMENT, config.LOG_LEVEL
+    print(
+        f"{_OK} Configuration loaded\n"
+        f"Database URL: {database_url}\n"
+        f"Environment: {environment}\n"
+        f"Log level: {log_level}"
+    )
     
-    if passed == total:
-        print("🎉 All tests passed! Setup looks good.")
-        return 0
-    else:
-        print("⚠️  Some tests failed. Please check the setup.")
-        return 1
+    assert database_url
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(pytest.main([__file__]))